@@ -5,6 +5,6 @@ path: qton/__init__.py
 __version__ = '1.1.0'
 __author__ = 'Yunheng Ma'
 
-__all__ = ['Quantum_circuit']
+__all__ = ['Quantum_circuit', 'Batch_circuit', 'Hamiltonian']
 
-from .quantum_circuit import Quantum_circuit
\ No newline at end of file
+from .quantum_circuit import Quantum_circuit, Batch_circuit, Hamiltonian
\ No newline at end of file
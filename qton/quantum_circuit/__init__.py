@@ -2,6 +2,8 @@
 path: qton/quantum_circuit/__init__.py
 '''
 
-__all__ = ['Quantum_circuit']
+__all__ = ['Quantum_circuit', 'Batch_circuit', 'Hamiltonian']
 
-from .quantum_circuit import Quantum_circuit
\ No newline at end of file
+from .quantum_circuit import Quantum_circuit
+from .batch_circuit import Batch_circuit
+from .hamiltonian import Hamiltonian
\ No newline at end of file
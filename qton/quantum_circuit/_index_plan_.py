@@ -0,0 +1,146 @@
+'''
+path: qton/quantum_circuit/_index_plan_.py
+content:
+
+  function,
+      _index_plan_
+  class,
+      _Plan_cache_
+
+'''
+
+from sys import getsizeof
+from collections import OrderedDict
+
+
+def _index_plan_(num_qubits, ctrl, targ, ctrl_state):
+    '''
+    Build the index plan of a gate on given qubits.
+
+    The state vector is viewed as a tensor with one axis per qubit, after 
+    any leading batch axes. Indices start with an Ellipsis for batch axes.
+
+    -In:
+        num_qubits --- number of qubits.
+            type: int
+        ctrl --- control qubits.
+            type: int tuple
+        targ --- target qubits.
+            type: int tuple
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            type: int tuple
+    -Out:
+        plan --- (sub, bases).
+            sub --- index of the view where all controls are satisfied.
+                type: tuple
+            bases --- index of the view for each basis of target qubits, 
+                with all controls satisfied.
+                type: tuple list
+            type: tuple
+    '''
+    loc = [slice(None)] * num_qubits
+    for i, b in zip(ctrl, ctrl_state):
+        loc[i] = b
+    sub = (Ellipsis, ) + tuple(loc)
+
+    bases = []
+    for j in range(2**len(targ)):
+        for i, b in zip(targ, format(j, '0%db' % len(targ))):
+            loc[i] = int(b)
+        bases.append((Ellipsis, ) + tuple(loc))
+
+    plan = (sub, bases)
+    return plan
+
+
+def _sizeof_(obj):
+    '''
+    Approximate memory size of nested tuples and lists, in bytes.
+    '''
+    size = getsizeof(obj)
+    if type(obj) in (tuple, list):
+        size += sum(_sizeof_(i) for i in obj)
+    return size
+
+
+class _Plan_cache_(object):
+    '''
+    Bounded LRU cache of index plans.
+
+    Plans are keyed by (num_qubits, ctrl, targ, ctrl_state). The least recently used 
+    plan is dropped when the cache holds more than "maxsize" plans, or more 
+    than "maxmemory" bytes.
+
+    Example for usage:
+
+        Check the cache statistics:
+            Quantum_circuit.plan_cache.hits
+            Quantum_circuit.plan_cache.misses
+            Quantum_circuit.plan_cache.memory
+    '''
+    maxsize = 4096
+    maxmemory = 2**24
+    hits = 0
+    misses = 0
+    memory = 0
+
+    def __init__(self, maxsize=4096, maxmemory=2**24):
+        '''
+        -In:
+            maxsize --- maximum number of plans.
+                type: int
+            maxmemory --- maximum memory of plans, in bytes.
+                type: int
+        '''
+        self.maxsize = maxsize
+        self.maxmemory = maxmemory
+        self._plans_ = OrderedDict()
+
+    def __len__(self):
+        return len(self._plans_)
+
+    def get(self, num_qubits, ctrl, targ, ctrl_state=None):
+        '''
+        Get the index plan of a gate, build it if not cached.
+
+        -In:
+            num_qubits --- number of qubits.
+                type: int
+            ctrl --- control qubits.
+                type: int sequence
+            targ --- target qubits.
+                type: int sequence
+            ctrl_state --- required state of each control qubit, 0 or 1.
+                All controls on |1> by default.
+                type: int sequence
+
+        -Return:
+            plan --- see "_index_plan_".
+                type: tuple
+        '''
+        if ctrl_state is None:
+            ctrl_state = [1] * len(ctrl)
+        key = (num_qubits, tuple(ctrl), tuple(targ), tuple(ctrl_state))
+        if key in self._plans_:
+            self.hits += 1
+            self._plans_.move_to_end(key)
+            return self._plans_[key][0]
+
+        self.misses += 1
+        plan = _index_plan_(*key)
+        size = _sizeof_(plan)
+        self._plans_[key] = (plan, size)
+        self.memory += size
+        while len(self._plans_) > self.maxsize or (
+                self.memory > self.maxmemory and len(self._plans_) > 1):
+            self.memory -= self._plans_.popitem(last=False)[1][1]
+        return plan
+
+    def clear(self):
+        '''
+        Drop all plans and reset the statistics.
+        '''
+        self._plans_.clear()
+        self.hits = 0
+        self.misses = 0
+        self.memory = 0
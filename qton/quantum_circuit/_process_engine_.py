@@ -0,0 +1,301 @@
+'''
+path: qton/quantum_circuit/_process_engine_.py
+content:
+
+  function,
+      _attach_
+      _apply_chunk_
+      _swap_chunks_
+      _release_
+  class,
+      _Process_engine_
+
+'''
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from weakref import finalize
+from numpy import ndarray, dtype as _dtype_
+from qton.quantum_gate import Swap_gate
+
+# shared states and local circuits attached in a worker process
+_attached_ = {}
+
+
+def _attach_(name, dtype, num_qubits):
+    '''
+    Attach a shared state in a worker process, once for each worker.
+
+    -In:
+        name --- name of the shared memory block.
+            type: str
+        dtype --- precision of the state.
+            type: str
+        num_qubits --- number of qubits.
+            type: int
+
+    -Return:
+        state --- qubit state vector in the shared memory.
+            type: numpy.ndarray, complex
+        circuits --- local circuits of chunks.
+            type: dict
+    '''
+    if name not in _attached_:
+        shm = SharedMemory(name)
+        state = ndarray((2**num_qubits, ), dtype, buffer=shm.buf)
+        _attached_[name] = (shm, state, {})
+    return _attached_[name][1:]
+
+
+def _apply_chunk_(name, dtype, num_qubits, num_global, c, group):
+    '''
+    Apply a group of instructions on a chunk of a shared state.
+
+    This runs in a worker process. All targets are out of the global
+    qubits, whose values are fixed in chunk "c".
+
+    -In:
+        name --- name of the shared memory block.
+            type: str
+        dtype --- precision of the state.
+            type: str
+        num_qubits --- number of qubits.
+            type: int
+        num_global --- number of global qubits.
+            type: int
+        c --- index of the chunk.
+            type: int
+        group --- instructions on the whole state.
+            type: list
+    '''
+    from .quantum_circuit import Quantum_circuit
+
+    state, circuits = _attach_(name, dtype, num_qubits)
+    if c not in circuits:
+        length = 2**(num_qubits - num_global)
+        local = Quantum_circuit(0, dtype=dtype)
+        local.num_qubits = num_qubits - num_global
+        local.statevector = state[c * length:(c + 1) * length]
+        circuits[c] = local
+    local = circuits[c]
+
+    bits = [int(b) for b in format(c, '0%db' % num_global)]
+    for instruction in group:
+        instruction = Quantum_circuit._localize_(instruction, bits)
+        if instruction is not None:
+            local._controlled_manipulation_(*instruction)
+
+
+def _swap_chunks_(name, dtype, num_qubits, num_global, c, qubit1, qubit2):
+    '''
+    Swap a global qubit with another qubit, on chunk "c" and its partner.
+
+    This runs in a worker process. "qubit1" is global and reads 0 in
+    chunk "c". If "qubit2" is also global, it reads 1 in chunk "c", and
+    the whole chunk is exchanged with the partner. Otherwise half of the
+    chunk, where "qubit2" reads 1, is exchanged with the half of the
+    partner where "qubit2" reads 0.
+
+    -In:
+        name --- name of the shared memory block.
+            type: str
+        dtype --- precision of the state.
+            type: str
+        num_qubits --- number of qubits.
+            type: int
+        num_global --- number of global qubits.
+            type: int
+        c --- index of the chunk.
+            type: int
+        qubit1 --- global qubit.
+            type: int
+        qubit2 --- the other qubit.
+            type: int
+    '''
+    state = _attach_(name, dtype, num_qubits)[0]
+    length = 2**(num_qubits - num_global)
+    bit1 = 1 << (num_global - 1 - qubit1)
+    if qubit2 < num_global:
+        p = c ^ bit1 ^ (1 << (num_global - 1 - qubit2))
+        part = state[c * length:(c + 1) * length]
+        other = state[p * length:(p + 1) * length]
+    else:
+        p = c | bit1
+        shape = (2**(qubit2 - num_global), 2, -1)
+        part = state[c * length:(c + 1) * length].reshape(shape)[:, 1]
+        other = state[p * length:(p + 1) * length].reshape(shape)[:, 0]
+    tmp = part.copy()
+    part[...] = other
+    other[...] = tmp
+
+
+def _release_(shm, executor):
+    '''
+    Stop the workers and free the shared memory block.
+    '''
+    executor.shutdown()
+    try:
+        shm.close()
+    except BufferError:
+        # views of the state are still held, the block is unmapped later
+        pass
+    shm.unlink()
+
+
+class _Process_engine_(object):
+    '''
+    Shared-memory state vector, updated by a pool of worker processes.
+
+    The state lives in a shared memory block. Its leading "num_global"
+    qubits are global, they split the state into 2**num_global chunks of
+    contiguous amplitudes, one for each worker. Runs of instructions with
+    all targets out of global qubits are sent to the workers as a group,
+    each worker updates its own chunk, and controls on global qubits are
+    checked against the chunk.
+
+    The parent only waits for the workers at a gate targeting a global
+    qubit. Then the global qubit is swapped with a local one across
+    chunks, and the later instructions follow the new layout. The
+    layout is restored at the end of each run.
+    '''
+    num_qubits = 0
+    num_global = 0
+    shm = None
+    executor = None
+
+    def __init__(self, num_qubits, dtype, num_workers):
+        '''
+        -In:
+            num_qubits --- number of qubits.
+                type: int
+            dtype --- precision of the state.
+                type: numpy.dtype
+            num_workers --- number of worker processes, rounded down to a
+                power of 2.
+                type: int
+
+        -Influenced:
+            self.num_qubits --- number of qubits.
+                type: int
+            self.num_global --- number of global qubits.
+                type: int
+            self.shm --- shared memory block of the state.
+                type: multiprocessing.shared_memory.SharedMemory
+            self.executor --- pool of worker processes.
+                type: concurrent.futures.ProcessPoolExecutor
+            self.statevector --- qubit state vector in the shared memory.
+                type: numpy.ndarray, complex
+        '''
+        dtype = _dtype_(dtype)
+        self.num_qubits = num_qubits
+        # at least one qubit is left local
+        self.num_global = max(
+            min(max(num_workers, 1).bit_length() - 1, num_qubits - 1), 0)
+        self.shm = SharedMemory(create=True,
+                                size=2**num_qubits * dtype.itemsize)
+        self.statevector = ndarray((2**num_qubits, ), dtype,
+                                   buffer=self.shm.buf)
+        self.statevector[:] = 0.
+        self.executor = ProcessPoolExecutor(2**self.num_global)
+        finalize(self, _release_, self.shm, self.executor)
+
+    def _run_(self, func, tasks):
+        '''
+        Run tasks on the workers, and wait for all of them.
+
+        -In:
+            func --- function to run in workers.
+                type: function
+            tasks --- arguments after the common ones.
+                type: list of tuples
+        '''
+        args = (self.shm.name, self.statevector.dtype.str, self.num_qubits,
+                self.num_global)
+        futures = [self.executor.submit(func, *(args + task))
+                   for task in tasks]
+        wait(futures)
+        for future in futures:
+            # raise errors from workers
+            future.result()
+
+    def _flush_(self, group):
+        '''
+        Apply a group of instructions on all chunks, then empty the group.
+        '''
+        if group:
+            self._run_(_apply_chunk_,
+                       [(c, list(group)) for c in range(2**self.num_global)])
+            del group[:]
+
+    def _exchange_(self, layout, qubit1, qubit2, group):
+        '''
+        Swap two qubits of the state, and track it in the layout.
+
+        Two local qubits are swapped by a local gate in the group. A swap
+        with a global qubit goes across chunks, the group is applied
+        before it.
+
+        -In:
+            layout --- position of each logical qubit in the state.
+                type: list
+            qubit1 --- first position.
+                type: int
+            qubit2 --- second position, greater than "qubit1".
+                type: int
+            group --- pending local instructions.
+                type: list
+        '''
+        g = self.num_global
+        if qubit1 >= g:
+            group.append((Swap_gate(), (), (qubit1, qubit2), None))
+        else:
+            self._flush_(group)
+            bit1 = 1 << (g - 1 - qubit1)
+            if qubit2 < g:
+                bit2 = 1 << (g - 1 - qubit2)
+                chunks = [c for c in range(2**g) if not c & bit1 and c & bit2]
+            else:
+                chunks = [c for c in range(2**g) if not c & bit1]
+            self._run_(_swap_chunks_, [(c, qubit1, qubit2) for c in chunks])
+        i, j = layout.index(qubit1), layout.index(qubit2)
+        layout[i], layout[j] = qubit2, qubit1
+
+    def execute(self, circuit, instructions):
+        '''
+        Execute instructions on the shared state.
+
+        -In:
+            circuit --- circuit of the state, runs gates too wide for a
+                chunk in the parent.
+                type: qton.Quantum_circuit
+            instructions --- instructions in order.
+                type: list
+
+        -Influenced:
+            self.statevector --- qubit state vector in the shared memory.
+                type: numpy.ndarray, complex
+        '''
+        n, g = self.num_qubits, self.num_global
+        layout = list(range(n))
+        group = []
+        for gate, ctrl, targ, ctrl_state in instructions:
+            if g == 0 or len(targ) > n - g:
+                # not enough local qubits, apply on the whole state
+                self._flush_(group)
+                circuit._controlled_manipulation_(
+                    gate.matrix, tuple(layout[i] for i in ctrl),
+                    tuple(layout[i] for i in targ), ctrl_state)
+                continue
+            for i in targ:
+                if layout[i] < g:
+                    used = set(layout[j] for j in targ)
+                    local = min(set(range(g, n)) - used)
+                    self._exchange_(layout, layout[i], local, group)
+            group.append((gate, tuple(layout[i] for i in ctrl),
+                          tuple(layout[i] for i in targ), ctrl_state))
+
+        # move each logical qubit back to its own position
+        for i in range(n):
+            if layout[i] != i:
+                self._exchange_(layout, i, layout[i], group)
+        self._flush_(group)
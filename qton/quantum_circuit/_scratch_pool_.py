@@ -0,0 +1,109 @@
+'''
+path: qton/quantum_circuit/_scratch_pool_.py
+content:
+
+  class,
+      _Scratch_pool_
+
+'''
+
+from itertools import product
+from numpy import empty
+
+
+class _Scratch_pool_(object):
+    '''
+    Pool of reusable scratch buffers of a circuit.
+
+    Kernels which need temporaries get them from here, instead of 
+    allocating for every gate. A buffer is kept by its name and dtype, 
+    and only grows. Views of the state are split into chunks, so that 
+    all buffers of a kernel together hold at most "blocksize" elements.
+    '''
+    blocksize = 2**20
+
+    def __init__(self, blocksize=2**20):
+        '''
+        -In:
+            blocksize --- maximum number of elements in scratch buffers.
+                type: int
+        '''
+        self.blocksize = blocksize
+        self._buffers_ = {}
+
+    def __len__(self):
+        return len(self._buffers_)
+
+    @property
+    def memory(self):
+        '''
+        Bytes held by all buffers.
+        '''
+        return sum(buf.nbytes for buf in self._buffers_.values())
+
+    def get(self, name, shape, dtype):
+        '''
+        Get a scratch buffer, its content is undefined.
+
+        -In:
+            name --- name of the buffer.
+                type: str
+            shape --- shape of the buffer.
+                type: int tuple
+            dtype --- data type of the buffer.
+                type: numpy.dtype
+
+        -Return:
+            buffer --- contiguous scratch buffer.
+                type: numpy.ndarray
+        '''
+        size = 1
+        for i in shape:
+            size *= i
+        key = (name, dtype)
+        buf = self._buffers_.get(key)
+        if buf is None or len(buf) < size:
+            buf = empty(size, dtype)
+            self._buffers_[key] = buf
+        return buf[:size].reshape(shape)
+
+    def chunks(self, shape, num_batch=0, num_parts=1, min_chunks=1):
+        '''
+        Split a view of the state into chunks along its leading qubit axes.
+        Scratch for "num_parts" chunks fits in "blocksize", and there are 
+        at least "min_chunks" chunks if possible, such as one for each 
+        worker.
+
+        -In:
+            shape --- shape of the view, batch axes first, then qubit axes.
+                type: int tuple
+            num_batch --- number of batch axes.
+                type: int
+            num_parts --- number of such chunks held in scratch at once.
+                type: int
+            min_chunks --- least number of chunks.
+                type: int
+
+        -Return:
+            chunks --- indices of chunks.
+                type: generator of tuples
+        '''
+        size = num_parts
+        for i in shape:
+            size *= i
+        num = 1
+        m = num_batch
+        while m < len(shape) and (size > self.blocksize or num < min_chunks):
+            size //= shape[m]
+            num *= shape[m]
+            m += 1
+
+        lead = (slice(None), ) * num_batch
+        for bits in product(*[range(i) for i in shape[num_batch:m]]):
+            yield lead + bits + (Ellipsis, )
+
+    def clear(self):
+        '''
+        Drop all buffers.
+        '''
+        self._buffers_.clear()
@@ -0,0 +1,108 @@
+'''
+path: qton/quantum_circuit/adjoint.py
+content:
+
+    function,
+        _derivative_
+        adjoint_gradient
+        
+'''
+
+from numpy import array, pi, vdot
+from qton.quantum_gate._basic_gate_ import _Parameter_gate_, _inverse_
+from .expectation import _observable_, _apply_observable_
+
+
+def _derivative_(gate, index):
+    '''
+    Derivative of a gate matrix over one of its parameters.
+
+    A parameter entering as a half angle, or as a full angle, gives a matrix 
+    of frequency w = 1/2, or w = 1. Then the derivative is exactly
+
+        w/2 * (U(p + pi/(2w)) - U(p - pi/(2w)))
+
+    -In:
+        gate --- parameterised gate, without any controls added.
+            type: qton.quantum_gate._basic_gate_._Parameter_gate_
+        index --- index of the parameter.
+            type: int
+
+    -Return:
+        matrix --- derivative matrix.
+            type: numpy.ndarray
+    '''
+    w = 0.5 if gate.half_angles[index] else 1.
+    shift = pi / (2 * w)
+    parameters = list(gate.parameters)
+    parameters[index] += shift
+    upper = type(gate)(parameters, inverse=gate.inverse).matrix
+    parameters[index] -= 2 * shift
+    lower = type(gate)(parameters, inverse=gate.inverse).matrix
+    return w / 2 * (upper - lower)
+
+
+def adjoint_gradient(self, observable):
+    '''
+    Gradient of an expectation value by adjoint differentiation.
+
+    Pending instructions are run forward once. Then going backward, the 
+    state and a co-state O|psi> are uncomputed by inverse gates, and the 
+    derivative of each parameter is read from their overlap. Only three 
+    more state vectors are held, whatever the number of parameters, and 
+    temporaries are bounded by the scratch pool.
+
+    Same result and order as "gradient". Instructions are kept, the state 
+    is not changed.
+
+    -In:
+        observable --- Pauli string like 'XIZ', one letter for each qubit, 
+            or Pauli sum as {Pauli string: coefficient}, or Hamiltonian, 
+            or Hermitian matrix.
+            type: str, dict, Hamiltonian, or numpy.ndarray
+
+    -Return:
+        grad --- derivatives of the expectation value, one for each 
+            parameter, in the order of pending instructions.
+            type: numpy.ndarray, float
+    '''
+    if self._statevector_.ndim != 1:
+        raise Exception('Not supported for a batch of circuits.')
+    observable = _observable_(observable, self.num_qubits)
+
+    # circuits run one at a time, thus share scratch buffers
+    forward = type(self)(self.num_qubits, dtype=self.dtype)
+    forward.scratch = self.scratch
+    forward.statevector[...] = self._statevector_
+    for gate, ctrl, targ, ctrl_state in self.instructions:
+        forward._controlled_manipulation_(gate.matrix, ctrl, targ, ctrl_state)
+
+    costate = type(self)(self.num_qubits, dtype=self.dtype)
+    _apply_observable_(forward.statevector, self.num_qubits, observable,
+                       costate.statevector, self.scratch)
+    costate.scratch = self.scratch
+    scratch = type(self)(self.num_qubits, dtype=self.dtype)
+    scratch.scratch = self.scratch
+
+    shape = [2] * self.num_qubits
+    grad = []
+    for gate, ctrl, targ, ctrl_state in reversed(self.instructions):
+        inverse = _inverse_(gate.matrix)
+        forward._controlled_manipulation_(inverse, ctrl, targ, ctrl_state)
+
+        if isinstance(gate, _Parameter_gate_):
+            # derivative of a controlled gate vanishes out of the subspace
+            loc = self.plan_cache.get(self.num_qubits, ctrl, targ,
+                                      ctrl_state)[0]
+            for m in reversed(range(len(gate.half_angles))):
+                scratch.statevector[:] = 0.
+                scratch.statevector.reshape(shape)[loc] = \
+                    forward.statevector.reshape(shape)[loc]
+                scratch._controlled_manipulation_(_derivative_(gate, m), ctrl,
+                                                  targ, ctrl_state)
+                grad.append(2 * vdot(costate.statevector,
+                                     scratch.statevector).real)
+
+        costate._controlled_manipulation_(inverse, ctrl, targ, ctrl_state)
+
+    return array(grad[::-1], float)
@@ -0,0 +1,141 @@
+'''
+path: qton/quantum_circuit/batch_circuit.py
+content:
+
+    class,
+        Batch_circuit
+        
+'''
+
+__all__ = ['Batch_circuit']
+
+from numpy import zeros, sqrt, asarray, broadcast_to, einsum, iscomplexobj
+from .quantum_circuit import Quantum_circuit
+from ._scratch_pool_ import _Scratch_pool_
+
+
+class Batch_circuit(Quantum_circuit):
+    '''
+    A batch of circuits of a same structure, executed together.
+
+    State vectors of the batch are stacked as rows of a 2-D array, of shape 
+    (batch_size, 2**num_qubits). Parameterised gate methods take arrays of 
+    angles, one for each circuit, then the stacked gate matrices are applied 
+    on all rows in one pass. A single angle is shared by all circuits.
+
+    Example for usage:
+
+        Create an instance:
+            bc = Batch_circuit(num_qubits, batch_size)
+
+        Sweep an angle over the batch:
+            bc.h(0)
+            bc.rx(numpy.linspace(0, numpy.pi, batch_size), 1)
+            bc.cp(numpy.random.random(batch_size), 0, 1)
+
+        Invoke the state of the 3rd circuit:
+            bc.statevector[2]
+    '''
+    batch_size = 0
+
+    def __init__(self, num_qubits=0, batch_size=1, deferred=False,
+                 dtype=complex):
+        '''
+        All circuits start from |0...0> state by default.
+
+        -In:
+            num_qubits --- number of qubits.
+                type: int
+            batch_size --- number of circuits in the batch.
+                type: int
+            deferred --- record gates as instructions instead of applying 
+                them immediately.
+                type: bool
+            dtype --- precision of the states, complex64 or complex128.
+                type: numpy.dtype
+        
+        -Influenced:
+            self.num_qubits --- number of qubits.
+                type: int
+            self.batch_size --- number of circuits in the batch.
+                type: int
+            self.deferred --- deferred mode or not.
+                type: bool
+            self.instructions --- pending instructions.
+                type: list
+            self.dtype --- precision of the states.
+                type: numpy.dtype
+            self.scratch --- scratch buffers of kernels.
+                type: _Scratch_pool_
+            self.statevector --- state vectors of the batch.
+                type: numpy.ndarray, complex
+        '''
+        self.num_qubits = num_qubits
+        self.batch_size = batch_size
+        self.deferred = deferred
+        self.instructions = []
+        self.clbits = []
+        self.dtype = self._precision_(dtype)
+        self.scratch = _Scratch_pool_()
+        self.statevector = zeros((batch_size, 2**num_qubits), self.dtype)
+        self.statevector[:, 0] = 1.0
+
+    def initialize(self, statevector):
+        '''
+        Initialize the batch with state vectors. 
+        A single vector is copied to all circuits. Each vector is normalized 
+        before continue, thus zero vector is forbidden. The vectors are 
+        written into the states in place.
+
+        -In:
+            statevector --- qubit state vector, or one for each circuit.
+                type: numpy.ndarray, complex
+
+        -Influenced:
+            self.instructions --- pending instructions, discarded.
+                type: list
+            self.statevector --- state vectors of the batch.
+                type: numpy.ndarray, complex
+        '''
+        vec = asarray(statevector)
+        vec = broadcast_to(vec, (self.batch_size, ) + vec.shape[-1:])
+        ket = self._statevector_
+        num = min(vec.shape[-1], 2**self.num_qubits)
+        part = vec[:, :num]
+        norm = einsum('ij,ij->i', part.real, part.real)
+        if iscomplexobj(part):
+            norm += einsum('ij,ij->i', part.imag, part.imag)
+        norm = sqrt(norm)
+        if (norm == 0.0).any():
+            raise Exception('Zero norm detected.')
+
+        self.instructions = []
+        ket[:, num:] = 0.
+        ket[:, :num] = part
+        ket /= norm[:, None]
+
+    def measure(self, shots=1024, samples=False, qubits=None):
+        '''
+        Take measurements on each circuit of the batch. 
+
+        -In:
+            shots --- measurement times.
+                type: int
+            samples --- return the measured basis of each shot, as integers, 
+                instead of counts.
+                type: bool
+            qubits --- qubits to measure, in the order of output bits. All 
+                qubits by default.
+                type: int, or int sequence
+
+        -Return:
+            counts --- counts of measurement outputs, or measured basis of 
+                each shot, one for each circuit.
+                type: list
+        '''
+        counts = []
+        for ket in self.statevector:
+            qc = Quantum_circuit(self.num_qubits)
+            qc.statevector = ket
+            counts.append(qc.measure(shots, samples, qubits))
+        return counts
@@ -0,0 +1,132 @@
+'''
+path: qton/quantum_circuit/collapse.py
+content:
+
+    function,
+        collapse
+        condition
+    class,
+        _Condition_
+        
+'''
+
+from numpy import einsum, sqrt
+from numpy.random import random
+
+
+def collapse(self, qubits, clbits=None):
+    '''
+    Single-shot projective measurement, the state collapses in place.
+
+    Qubits are measured one by one. Probabilities of the two outcomes are 
+    summed over views of the state, then the other half is set to zero and 
+    the kept half is renormalized. The state is never copied, and left 
+    untouched if the qubit is already in a basis state.
+
+    -In:
+        qubits --- qubits to measure.
+            type: int, or int sequence
+        clbits --- classical bits to store the outcomes, one for each qubit.
+            type: int, or int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+        self.clbits --- classical bits.
+            type: list
+
+    -Return:
+        outcomes --- measured value of each qubit, 0 or 1.
+            type: list
+    '''
+    if type(qubits) is int:
+        qubits = [qubits]
+    if type(clbits) is int:
+        clbits = [clbits]
+    qubits = list(qubits)
+    if len(set(qubits)) < len(qubits):
+        raise Exception('Cannot be same qubits.')
+    for i in qubits:
+        if i < 0 or i >= self.num_qubits:
+            raise Exception('Qubit index out of range.')
+    if clbits is not None:
+        clbits = list(clbits)
+        if len(clbits) != len(qubits):
+            raise Exception('Number of classical bits does not match.')
+        for c in clbits:
+            if c < 0 or c >= len(self.clbits):
+                raise Exception('Classical bit index out of range.')
+    if self.statevector.ndim != 1:
+        raise Exception('Not supported for a batch of circuits.')
+
+    state = self.statevector
+    outcomes = []
+    for i in qubits:
+        # qubit i splits the state into blocks of 2**(n-i-1) amplitudes
+        psi = state.reshape(2**i, 2, -1)
+        # real and imaginary parts side by side, as a view
+        flat = state.view(state.real.dtype).reshape(2**i, 2, -1)
+        prob = [
+            einsum('ij,ij->', flat[:, b], flat[:, b], dtype=float)
+            for b in (0, 1)
+        ]
+        b = 1 if random() * (prob[0] + prob[1]) < prob[1] else 0
+        if prob[1 - b] != 0:
+            psi[:, 1 - b] = 0.
+            psi[:, b] *= 1 / sqrt(prob[b])
+        outcomes.append(b)
+
+    if clbits is not None:
+        for c, b in zip(clbits, outcomes):
+            self.clbits[c] = b
+    return outcomes
+
+
+class _Condition_(object):
+    '''
+    Context of gates conditioned on classical bits.
+    Gates are skipped inside the context, if the condition does not hold.
+    '''
+
+    def __init__(self, circuit, holds):
+        self.circuit = circuit
+        self.holds = holds
+
+    def __enter__(self):
+        self.prior = self.circuit._skip_
+        self.circuit._skip_ = self.prior or not self.holds
+        return self.holds
+
+    def __exit__(self, *args):
+        self.circuit._skip_ = self.prior
+
+
+def condition(self, clbits, value=1):
+    '''
+    Condition gates on classical bits, used in a "with" statement.
+
+        with qc.condition([0, 1], 2):
+            qc.x(3)
+
+    applies X on qubit 3 only if classical bits 0 and 1 read '10'. The 
+    condition is checked on entering, thus gates recorded in deferred 
+    mode are unconditional.
+
+    -In:
+        clbits --- classical bits to check.
+            type: int, or int sequence
+        value --- expected value of the bits, the first bit is the most 
+            significant.
+            type: int
+
+    -Return:
+        context --- condition context.
+            type: _Condition_
+    '''
+    if type(clbits) is int:
+        clbits = [clbits]
+    for c in clbits:
+        if c < 0 or c >= len(self.clbits):
+            raise Exception('Classical bit index out of range.')
+    bits = ''.join(str(self.clbits[c]) for c in clbits)
+    return _Condition_(self, int(bits, 2) == value)
@@ -49,7 +49,7 @@ def swap(self, qubit1, qubit2):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(Swap_gate.matrix, qubit1, qubit2)
+    self._double_qubit_manipulation_(Swap_gate(), qubit1, qubit2)
 
 
 def ch(self, ctrl, targ):
@@ -66,7 +66,7 @@ def ch(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(H_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(H_gate(), [ctrl], [targ])
 
 
 def cx(self, ctrl, targ):
@@ -83,7 +83,7 @@ def cx(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(X_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(X_gate(), [ctrl], [targ])
 
 
 def cy(self, ctrl, targ):
@@ -100,7 +100,7 @@ def cy(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(Y_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(Y_gate(), [ctrl], [targ])
 
 
 def cz(self, ctrl, targ):
@@ -117,7 +117,7 @@ def cz(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(Z_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(Z_gate(), [ctrl], [targ])
 
 
 def cs(self, ctrl, targ):
@@ -134,7 +134,7 @@ def cs(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(S_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(S_gate(), [ctrl], [targ])
 
 
 def ct(self, ctrl, targ):
@@ -151,7 +151,7 @@ def ct(self, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(T_gate(num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(T_gate(), [ctrl], [targ])
 
 
 def cp(self, phi, ctrl, targ):
@@ -170,8 +170,7 @@ def cp(self, phi, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        P_gate(parameters=[phi], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(P_gate(parameters=[phi]), [ctrl], [targ])
 
 
 def cu(self, theta, phi, lamda, gamma, ctrl, targ):
@@ -196,8 +195,7 @@ def cu(self, theta, phi, lamda, gamma, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        U_gate(parameters=[theta, phi, lamda, gamma], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(U_gate(parameters=[theta, phi, lamda, gamma]), [ctrl], [targ])
 
 
 def crx(self, theta, ctrl, targ):
@@ -216,8 +214,7 @@ def crx(self, theta, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        Rx_gate(parameters=[theta], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(Rx_gate(parameters=[theta]), [ctrl], [targ])
 
 
 def cry(self, theta, ctrl, targ):
@@ -236,8 +233,7 @@ def cry(self, theta, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        Ry_gate(parameters=[theta], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(Ry_gate(parameters=[theta]), [ctrl], [targ])
 
 
 def crz(self, theta, ctrl, targ):
@@ -256,8 +252,7 @@ def crz(self, theta, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        Rz_gate(parameters=[theta], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(Rz_gate(parameters=[theta]), [ctrl], [targ])
 
 
 def cu1(self, lamda, ctrl, targ):
@@ -276,8 +271,7 @@ def cu1(self, lamda, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        U1_gate(parameters=[lamda], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(U1_gate(parameters=[lamda]), [ctrl], [targ])
 
 
 def cu2(self, phi, lamda, ctrl, targ):
@@ -298,8 +292,7 @@ def cu2(self, phi, lamda, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        U2_gate(parameters=[phi, lamda], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(U2_gate(parameters=[phi, lamda]), [ctrl], [targ])
 
 
 def cu3(self, theta, phi, lamda, ctrl, targ):
@@ -322,5 +315,4 @@ def cu3(self, theta, phi, lamda, ctrl, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._double_qubit_manipulation_(
-        U3_gate(parameters=[theta, phi, lamda], num_ctrl=1).matrix, ctrl, targ)
+    self._apply_(U3_gate(parameters=[theta, phi, lamda]), [ctrl], [targ])
@@ -0,0 +1,231 @@
+'''
+path: qton/quantum_circuit/expectation.py
+content:
+
+    function,
+        _observable_
+        _pauli_expectation_
+        _expectation_
+        _apply_observable_
+        expectation
+        
+'''
+
+from numpy import array, zeros_like, conjugate, multiply, matmul
+from .hamiltonian import Hamiltonian
+from ._scratch_pool_ import _Scratch_pool_
+
+
+def _observable_(observable, num_qubits):
+    '''
+    Check an observable and bring it to a normal form.
+
+    -In:
+        observable --- Pauli string like 'XIZ', one letter for each qubit, 
+            or Pauli sum as {Pauli string: coefficient}, or Hamiltonian, 
+            or Hermitian matrix.
+            type: str, dict, Hamiltonian, or numpy.ndarray
+        num_qubits --- number of qubits.
+            type: int
+
+    -Return:
+        observable --- list of (coefficient, Pauli string), or Hamiltonian, 
+            or matrix.
+            type: list, Hamiltonian, or numpy.ndarray
+    '''
+    if isinstance(observable, Hamiltonian):
+        if observable.num_qubits != num_qubits:
+            raise Exception('Hamiltonian does not match the number of '
+                            'qubits.')
+        return observable
+    if type(observable) is str:
+        observable = {observable: 1.}
+    if isinstance(observable, dict):
+        terms = []
+        for pauli, coef in observable.items():
+            if len(pauli) != num_qubits:
+                raise Exception('Pauli string does not match the number of '
+                                'qubits.')
+            if set(pauli) - set('IXYZ'):
+                raise Exception('Invalid Pauli string.')
+            terms.append((coef, pauli))
+        return terms
+
+    obs = array(observable)
+    if obs.shape != (2**num_qubits, 2**num_qubits):
+        raise Exception('Observable does not match the number of qubits.')
+    return obs
+
+
+def _pauli_expectation_(statevector, num_qubits, pauli, scratch=None):
+    '''
+    Expectation value of a Pauli string, without building its matrix.
+
+    Each qubit is an axis of the state tensor. X and Y flip their axes, 
+    taken as reversed views. Z and Y put a sign (-1)^b on basis b of their 
+    axes, summed as the difference of the two slices. Y also brings a 
+    factor -i, since Y|b> = i(-1)^b |1-b>.
+
+    The state is reduced chunk by chunk along its leading qubit axes. A 
+    chunk is paired with the chunk its flips lead to, and their product 
+    is taken in a scratch buffer, so temporaries are bounded by the 
+    "blocksize" of the scratch pool, not by the state.
+
+    -In:
+        statevector --- qubit state vector, or a batch of them.
+            type: numpy.ndarray, complex
+        num_qubits --- number of qubits.
+            type: int
+        pauli --- Pauli string, one letter for each qubit.
+            type: str
+        scratch --- scratch buffers, a new pool if not given.
+            type: _Scratch_pool_
+
+    -Return:
+        value --- expectation value, one for each row of a batch.
+            type: float, or numpy.ndarray
+    '''
+    if scratch is None:
+        scratch = _Scratch_pool_()
+    num_batch = statevector.ndim - 1
+    psi = statevector.reshape(statevector.shape[:-1] + (2, ) * num_qubits)
+    value = 0.
+    for chunk in scratch.chunks(psi.shape, num_batch):
+        bits = chunk[num_batch:-1]
+        m = len(bits)
+        partner = tuple(1 - b if c in 'XY' else b
+                        for b, c in zip(bits, pauli))
+        flip = tuple(slice(None, None, -1) if c in 'XY' else slice(None)
+                     for c in pauli[m:])
+        part = psi[chunk]
+        other = psi[chunk[:num_batch] + partner + flip]
+        prod = scratch.get('in', part.shape, part.dtype)
+        conjugate(part, out=prod)
+        multiply(prod, other, out=prod)
+
+        # reduce qubit axes of the chunk from the last one
+        for c in reversed(pauli[m:]):
+            if c in 'YZ':
+                prod = prod[..., 0] - prod[..., 1]
+            else:
+                prod = prod.sum(axis=-1)
+
+        # signs on leading axes are fixed in the chunk
+        if sum(b for b, c in zip(bits, pauli) if c in 'YZ') % 2:
+            prod = -prod
+        value = value + prod
+
+    return ((-1j)**pauli.count('Y') * value).real
+
+
+def _expectation_(statevector, num_qubits, observable, scratch=None):
+    '''
+    Expectation value of an observable in normal form.
+
+    -In:
+        statevector --- qubit state vector, or a batch of them.
+            type: numpy.ndarray, complex
+        num_qubits --- number of qubits.
+            type: int
+        observable --- list of (coefficient, Pauli string), or Hamiltonian, 
+            or matrix.
+            type: list, Hamiltonian, or numpy.ndarray
+        scratch --- scratch buffers for Pauli strings.
+            type: _Scratch_pool_
+
+    -Return:
+        value --- expectation value, one for each row of a batch.
+            type: float, or numpy.ndarray
+    '''
+    if isinstance(observable, Hamiltonian):
+        return observable._evaluate_(statevector)
+    if isinstance(observable, list):
+        value = 0.
+        for coef, pauli in observable:
+            value = value + coef * _pauli_expectation_(
+                statevector, num_qubits, pauli, scratch)
+        return value
+    return (statevector.conj() * (statevector @ observable.T)).sum(-1).real
+
+
+def _apply_observable_(statevector, num_qubits, observable, out=None,
+                       scratch=None):
+    '''
+    Apply an observable in normal form on a state vector, out of place.
+
+    Each Pauli term is added into "out" chunk by chunk along the leading 
+    qubit axes, through a scratch buffer, so no temporary of the size of 
+    the state is made.
+
+    -In:
+        statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+        num_qubits --- number of qubits.
+            type: int
+        observable --- list of (coefficient, Pauli string), or Hamiltonian, 
+            or matrix.
+            type: list, Hamiltonian, or numpy.ndarray
+        out --- vector to write in, a new one if not given.
+            type: numpy.ndarray, complex
+        scratch --- scratch buffers, a new pool if not given.
+            type: _Scratch_pool_
+
+    -Return:
+        ket --- the observable applied on the state vector.
+            type: numpy.ndarray, complex
+    '''
+    ket = zeros_like(statevector) if out is None else out
+    if isinstance(observable, Hamiltonian):
+        observable = observable.terms
+    if not isinstance(observable, list):
+        matmul(observable, statevector, out=ket)
+        return ket
+
+    if scratch is None:
+        scratch = _Scratch_pool_()
+    shape = (2, ) * num_qubits
+    psi = statevector.reshape(shape)
+    phi = ket.reshape(shape)
+    ket[...] = 0.
+    for coef, pauli in observable:
+        factor = coef * (-1j)**pauli.count('Y')
+        for chunk in scratch.chunks(shape):
+            bits = chunk[:-1]
+            m = len(bits)
+            partner = tuple(1 - b if c in 'XY' else b
+                            for b, c in zip(bits, pauli))
+            flip = tuple(slice(None, None, -1) if c in 'XY' else slice(None)
+                         for c in pauli[m:])
+            term = scratch.get('in', phi[chunk].shape, ket.dtype)
+            # signs on leading axes are fixed in the chunk
+            sign = (-1)**sum(b for b, c in zip(bits, pauli) if c in 'YZ')
+            multiply(psi[partner + flip], sign * factor, out=term)
+            for i in range(m, num_qubits):
+                if pauli[i] in 'YZ':
+                    term[(slice(None), ) * (i - m) + (1, )] *= -1
+            phi[chunk] += term
+    return ket
+
+
+def expectation(self, observable):
+    '''
+    Exact expectation value of an observable on the circuit state.
+
+    Pauli strings and sums are evaluated on views of the state vector, no 
+    operator matrix is built, and temporaries are bounded by the scratch 
+    pool. A Hamiltonian is evaluated by groups of commuting terms. For a 
+    batch of circuits, one value is returned for each circuit.
+
+    -In:
+        observable --- Pauli string like 'XIZ', one letter for each qubit, 
+            or Pauli sum as {Pauli string: coefficient}, or Hamiltonian, 
+            or Hermitian matrix.
+            type: str, dict, Hamiltonian, or numpy.ndarray
+
+    -Return:
+        value --- expectation value.
+            type: float, or numpy.ndarray
+    '''
+    observable = _observable_(observable, self.num_qubits)
+    return _expectation_(self.statevector, self.num_qubits, observable,
+                         self.scratch)
@@ -0,0 +1,172 @@
+'''
+path: qton/quantum_circuit/fuse.py
+content:
+
+  function,
+      _full_matrix_
+      _embed_
+      fuse
+
+'''
+
+from numpy import kron, eye
+from qton.quantum_gate import Unitary_gate, X_gate, Swap_gate
+from qton.quantum_gate._basic_gate_ import _add_control_, _Parameter_gate_
+
+
+def _full_matrix_(instruction):
+    '''
+    Full matrix of an instruction, with controls added.
+
+    -In:
+        instruction --- (gate, ctrl, targ, ctrl_state).
+            type: tuple
+
+    -Out:
+        matrix --- gate matrix on "qubits".
+            type: numpy.ndarray
+        qubits --- qubits of the matrix, controls come first.
+            type: int tuple
+    '''
+    gate, ctrl, targ, ctrl_state = instruction
+    matrix = gate.matrix
+    if ctrl:
+        matrix = _add_control_(matrix, num_ctrl=len(ctrl))
+    if ctrl_state is not None:
+        # a control on |0> is a control on |1> sandwiched by X gates
+        flip = eye(1)
+        for b in ctrl_state + (1, ) * len(targ):
+            flip = kron(flip, eye(2) if b else X_gate.matrix)
+        matrix = flip @ matrix @ flip
+
+    qubits = ctrl + targ
+    return matrix, qubits
+
+
+def _embed_(matrix, qubits, block):
+    '''
+    Embed a gate matrix into the space of a block of one or two qubits.
+
+    -In:
+        matrix --- single- or double-qubit gate matrix.
+            type: numpy.ndarray
+        qubits --- qubits of "matrix".
+            type: int tuple
+        block --- qubits of the block.
+            type: int tuple
+
+    -Out:
+        embedded --- matrix on "block".
+            type: numpy.ndarray
+    '''
+    if qubits == block:
+        return matrix
+    if len(qubits) == 1:
+        if qubits[0] == block[0]:
+            return kron(matrix, eye(2))
+        return kron(eye(2), matrix)
+    return Swap_gate.matrix @ matrix @ Swap_gate.matrix
+
+
+def fuse(self):
+    '''
+    Fuse pending instructions, to reduce passes over the state vector.
+
+    Runs of single-qubit gates on the same qubit are multiplied into one 
+    2x2 matrix. Single-qubit gates next to a double-qubit gate, and 
+    double-qubit gates on the same pair of qubits, are multiplied into one 
+    4x4 matrix. A gate is only moved across gates on other qubits, thus 
+    the circuit is unchanged. Gates on three or more qubits are kept, so 
+    are stacked matrices of a batch. Parameterised gates are kept as well, 
+    and nothing is fused across them, so that "gradient" and 
+    "adjoint_gradient" still find all parameters.
+
+    This works on "self.instructions", thus makes sense in deferred mode.
+
+    -Influenced:
+        self.instructions --- pending instructions, fused.
+            type: list
+
+    -Return:
+        report --- number of instructions before and after fusion, and 
+            number of passes saved.
+            type: dict
+    '''
+    out = []
+    last = {}  # index in "out" of the latest instruction on each qubit
+    fused = {}  # index in "out" -> (matrix, qubits) of fused instructions
+    kept = set()  # indices in "out" of instructions kept as they are
+
+    def matrix_of(k):
+        if k in fused:
+            return fused[k]
+        return _full_matrix_(out[k])
+
+    def append(instruction, qubits):
+        out.append(instruction)
+        for i in qubits:
+            last[i] = len(out) - 1
+
+    for instruction in self.instructions:
+        gate, ctrl, targ, ctrl_state = instruction
+        qubits = ctrl + targ
+        j = [last.get(i) for i in qubits]
+
+        if gate.matrix.ndim > 2 or isinstance(gate, _Parameter_gate_):
+            append(instruction, qubits)
+            kept.add(len(out) - 1)
+            continue
+        # nothing is fused across an instruction of a batch, or with 
+        # parameters
+        j = [None if k in kept else k for k in j]
+
+        if len(qubits) == 1 and j[0] is not None:
+            # fold into the latest instruction on this qubit
+            prior, block = matrix_of(j[0])
+            if len(block) <= 2:
+                fused[j[0]] = (_embed_(gate.matrix, qubits, block) @ prior,
+                               block)
+                continue
+
+        if len(qubits) == 2:
+            if j[0] is not None and j[0] == j[1]:
+                # the latest instruction on both qubits
+                prior, block = matrix_of(j[0])
+                if len(block) == 2:
+                    matrix = _full_matrix_(instruction)[0]
+                    fused[j[0]] = (_embed_(matrix, qubits, block) @ prior,
+                                   block)
+                    continue
+
+            # absorb single-qubit gates right before it
+            singles = [k for k in set(j) - {None}
+                       if len(matrix_of(k)[1]) == 1]
+            if singles:
+                matrix = _full_matrix_(instruction)[0]
+                for k in singles:
+                    prior, block = matrix_of(k)
+                    matrix = matrix @ _embed_(prior, block, qubits)
+                    out[k] = None
+                append(instruction, qubits)
+                fused[len(out) - 1] = (matrix, qubits)
+                continue
+
+        append(instruction, qubits)
+
+    instructions = []
+    for k in range(len(out)):
+        if out[k] is None:
+            continue
+        if k in fused:
+            matrix, block = fused[k]
+            instructions.append((Unitary_gate(matrix), (), block, None))
+        else:
+            instructions.append(out[k])
+
+    report = {
+        'before': len(self.instructions),
+        'after': len(instructions),
+        'saved': len(self.instructions) - len(instructions),
+    }
+    self.instructions = instructions
+    return report
\ No newline at end of file
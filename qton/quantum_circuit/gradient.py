@@ -0,0 +1,122 @@
+'''
+path: qton/quantum_circuit/gradient.py
+content:
+
+    function,
+        _shift_rule_
+        gradient
+        
+'''
+
+from numpy import zeros, full, tile, pi, sqrt
+from qton.quantum_gate._basic_gate_ import _Parameter_gate_
+from .expectation import _observable_, _expectation_
+
+
+# (shift, coefficient) pairs of parameter-shift rules
+_two_term_ = ((pi / 2, 0.5), (-pi / 2, -0.5))
+_c1_ = (sqrt(2) + 1) / (4 * sqrt(2))
+_c2_ = (sqrt(2) - 1) / (4 * sqrt(2))
+_four_term_ = ((pi / 2, _c1_), (-pi / 2, -_c1_), (3 * pi / 2, -_c2_),
+               (-3 * pi / 2, _c2_))
+
+# bytes of shifted states held at once, if neither "memory" nor "budget"
+_memory_ = 2**30
+
+
+def _shift_rule_(half_angle, num_ctrl):
+    '''
+    Parameter-shift rule of a gate parameter.
+
+    A full phase angle, or a half angle without control, gives an 
+    expectation of a single frequency, thus two shifts are enough. A 
+    controlled half angle gives two frequencies, 1/2 and 1, which needs 
+    four shifts.
+
+    -In:
+        half_angle --- the parameter enters as a half angle or not.
+            type: bool
+        num_ctrl --- number of controls of the gate.
+            type: int
+
+    -Return:
+        rule --- (shift, coefficient) pairs.
+            type: tuple
+    '''
+    if half_angle and num_ctrl > 0:
+        return _four_term_
+    return _two_term_
+
+
+def gradient(self, observable, memory=None):
+    '''
+    Gradient of an expectation value by the parameter-shift rule.
+
+    Every parameter of pending instructions is shifted, and all shifted 
+    circuits are run together as a batch, from the state before pending 
+    instructions. Instructions are kept, the state is not changed.
+
+    The batch is split into sub-batches of at most "memory" bytes of 
+    states, at least one circuit each. By default it is the "budget" of 
+    the circuit, or 1 GB.
+
+    This works on "self.instructions", thus makes sense in deferred mode.
+
+    -In:
+        observable --- Pauli string like 'XIZ', one letter for each qubit, 
+            or Pauli sum as {Pauli string: coefficient}, or Hamiltonian, 
+            or Hermitian matrix.
+            type: str, dict, Hamiltonian, or numpy.ndarray
+        memory --- bytes of shifted states held at once.
+            type: int
+
+    -Return:
+        grad --- derivatives of the expectation value, one for each 
+            parameter, in the order of pending instructions.
+            type: numpy.ndarray, float
+    '''
+    if self._statevector_.ndim != 1:
+        raise Exception('Not supported for a batch of circuits.')
+    observable = _observable_(observable, self.num_qubits)
+
+    shifts = {}  # instruction index -> (parameter index, row, shift)
+    terms = []  # (gradient index, row, coefficient)
+    num_params = 0
+    for k, (gate, ctrl, targ, ctrl_state) in enumerate(self.instructions):
+        if not isinstance(gate, _Parameter_gate_):
+            continue
+        for m, half_angle in enumerate(gate.half_angles):
+            for shift, coef in _shift_rule_(half_angle, len(ctrl)):
+                shifts.setdefault(k, []).append((m, len(terms), shift))
+                terms.append((num_params, len(terms), coef))
+            num_params += 1
+
+    grad = zeros(num_params)
+    if not terms:
+        return grad
+
+    if memory is None:
+        memory = _memory_ if self.budget is None else self.budget
+    size = max(1, memory // (2**self.num_qubits * self.dtype.itemsize))
+    batch = type(self)(self.num_qubits)
+    for start in range(0, len(terms), size):
+        stop = min(start + size, len(terms))
+        batch.statevector = tile(self._statevector_, (stop - start, 1))
+        for k, (gate, ctrl, targ, ctrl_state) in enumerate(self.instructions):
+            matrix = gate.matrix
+            rows = [(m, row - start, shift)
+                    for m, row, shift in shifts.get(k, [])
+                    if start <= row < stop]
+            if rows:
+                parameters = [full(stop - start, p, float)
+                              for p in gate.parameters]
+                for m, row, shift in rows:
+                    parameters[m][row] += shift
+                matrix = type(gate)(parameters, inverse=gate.inverse).matrix
+            batch._controlled_manipulation_(matrix, ctrl, targ, ctrl_state)
+
+        values = _expectation_(batch.statevector, self.num_qubits,
+                               observable, self.scratch)
+        for i, row, coef in terms[start:stop]:
+            grad[i] += coef * values[row - start]
+    return grad
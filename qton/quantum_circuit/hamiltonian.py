@@ -0,0 +1,149 @@
+'''
+path: qton/quantum_circuit/hamiltonian.py
+content:
+
+    class,
+        Hamiltonian
+        
+'''
+
+__all__ = ['Hamiltonian']
+
+from numpy import sqrt, stack
+
+
+class Hamiltonian(object):
+    '''
+    Weighted sum of Pauli strings, grouped for fast expectation values.
+
+    Terms are put in groups of qubit-wise commuting strings, namely on each 
+    qubit they are the same letter or I. A group is measured in one basis: 
+    its X and Y qubits are rotated to Z on a scratch copy of the state, then 
+    all terms of the group are Z parities of one probability array. The 
+    parities of all subsets of qubits come from a single Walsh-Hadamard 
+    transform of this array, the index of each term in it is kept.
+
+    Example for usage:
+
+        Create an instance:
+            ham = Hamiltonian({'ZZI': 0.5, 'IZZ': 0.5, 'XXI': -1.0})
+
+        Expectation value on a circuit:
+            qc.expectation(ham)
+    '''
+    num_qubits = 0
+    terms = None
+    groups = None
+
+    def __init__(self, terms):
+        '''
+        -In:
+            terms --- {Pauli string: coefficient}, one letter for each qubit.
+                type: dict
+
+        -Influenced:
+            self.num_qubits --- number of qubits.
+                type: int
+            self.terms --- list of (coefficient, Pauli string).
+                type: list
+            self.groups --- list of (basis, support, [(coefficient, index)]).
+                type: list
+        '''
+        self.terms = []
+        for pauli, coef in terms.items():
+            if set(pauli) - set('IXYZ'):
+                raise Exception('Invalid Pauli string.')
+            if self.terms and len(pauli) != self.num_qubits:
+                raise Exception('Pauli strings of different lengths.')
+            self.num_qubits = len(pauli)
+            self.terms.append((coef, pauli))
+
+        # heavier strings first, they are harder to fit in a group
+        bases = []
+        members = []
+        for coef, pauli in sorted(self.terms,
+                                  key=lambda t: -sum(c != 'I' for c in t[1])):
+            for k in range(len(bases)):
+                if all(a == b or 'I' in (a, b)
+                       for a, b in zip(bases[k], pauli)):
+                    bases[k] = ''.join(b if a == 'I' else a
+                                       for a, b in zip(bases[k], pauli))
+                    members[k].append((coef, pauli))
+                    break
+            else:
+                bases.append(pauli)
+                members.append([(coef, pauli)])
+
+        self.groups = []
+        for basis, group in zip(bases, members):
+            support = [i for i in range(self.num_qubits) if basis[i] != 'I']
+            index = [(coef, tuple(int(pauli[i] != 'I') for i in support))
+                     for coef, pauli in group]
+            self.groups.append((basis, support, index))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _evaluate_(self, statevector):
+        '''
+        Expectation value on a state vector.
+
+        -In:
+            statevector --- qubit state vector, or a batch of them.
+                type: numpy.ndarray, complex
+
+        -Return:
+            value --- expectation value, one for each row of a batch.
+                type: float, or numpy.ndarray
+        '''
+        num_batch = statevector.ndim - 1
+        shape = statevector.shape[:-1] + (2, ) * self.num_qubits
+        value = 0.
+        for basis, support, index in self.groups:
+            psi = statevector.reshape(shape)
+            if set(basis) & set('XY'):
+                psi = psi.copy()
+                for i in range(self.num_qubits):
+                    if basis[i] in 'XY':
+                        self._rotate_(psi, num_batch + i, basis[i])
+            prob = psi.real**2 + psi.imag**2
+
+            # marginal on the support, then parities of all its subsets
+            prob = prob.sum(axis=tuple(num_batch + i
+                                       for i in range(self.num_qubits)
+                                       if i not in support))
+            for _ in support:
+                prob = stack([prob[..., 0] + prob[..., 1],
+                              prob[..., 0] - prob[..., 1]], axis=num_batch)
+
+            for coef, loc in index:
+                value = value + coef * prob[(Ellipsis, ) + loc]
+        return value
+
+    @staticmethod
+    def _rotate_(psi, axis, pauli):
+        '''
+        Rotate one qubit axis from X or Y basis to Z basis, in place.
+        H for X, H S^dagger for Y.
+
+        -In:
+            psi --- state tensor.
+                type: numpy.ndarray, complex
+            axis --- axis of the qubit.
+                type: int
+            pauli --- 'X' or 'Y'.
+                type: str
+
+        -Influenced:
+            psi --- state tensor.
+                type: numpy.ndarray, complex
+        '''
+        a0 = psi[(slice(None), ) * axis + (0, )]
+        a1 = psi[(slice(None), ) * axis + (1, )]
+        if pauli == 'Y':
+            a1 *= -1j
+        tmp = a0 - a1
+        a0 += a1
+        a1[...] = tmp
+        a0 *= sqrt(0.5)
+        a1 *= sqrt(0.5)
@@ -7,7 +7,7 @@ content:
         
 '''
 
-from numpy import zeros, sqrt, matmul
+from numpy import asarray, sqrt, einsum, iscomplexobj
 
 
 def initialize(self, statevector):
@@ -15,20 +15,30 @@ def initialize(self, statevector):
     Initialize the circuit state with a vector. 
     This vector will be normalized before continue, thus zero vector is forbidden.
 
+    The vector is written into the state in place, no copy is made.
+
     -In:
         statevector --- qubit state vector.
             type: numpy.ndarray, complex
 
     -Influenced:
+        self.instructions --- pending instructions, discarded.
+            type: list
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex.
     '''
-    ket = zeros(2**self.num_qubits, complex)
-    for i in range(min(len(statevector), len(ket))):
-        ket[i] = statevector[i]
-    norm = sqrt(matmul(ket.conj(), ket))
+    vec = asarray(statevector)
+    ket = self._statevector_
+    num = min(len(vec), len(ket))
+    part = vec[:num]
+    norm = einsum('i,i->', part.real, part.real)
+    if iscomplexobj(part):
+        norm += einsum('i,i->', part.imag, part.imag)
+    norm = sqrt(norm)
     if norm == 0.0:
         raise Exception('Zero norm detected.')
-    else:
-        ket = ket / norm
-    self.statevector = ket.copy()
\ No newline at end of file
+
+    self.instructions = []
+    ket[num:] = 0.
+    ket[:num] = part
+    ket /= norm
\ No newline at end of file
@@ -3,36 +3,138 @@ path: qton/quantum_circuit/measure.py
 content:
 
     function:
+        _sample_
+        _sample_chunks_
         measure
         
 '''
 
-from numpy import zeros, arange
-from numpy.random import choice
+from numpy import (cumsum, searchsorted, bincount, flatnonzero, transpose,
+                   einsum, empty, zeros)
+from numpy.random import random, shuffle
 
 
-def measure(self, shots=1024):
+def _sample_(prob, shots):
+    '''
+    Draw samples from a probability distribution, all in one pass.
+
+    Uniform numbers are located in the cumulative distribution, the 
+    distribution is not required to be normalized exactly. The cumulation 
+    is kept in double precision, whatever the precision of "prob".
+
+    -In:
+        prob --- probability of each outcome.
+            type: numpy.ndarray, float
+        shots --- number of samples.
+            type: int
+
+    -Return:
+        samples --- drawn outcomes.
+            type: numpy.ndarray, int
+    '''
+    cdf = cumsum(prob, dtype=float)
+    samples = searchsorted(cdf, random(shots) * cdf[-1], side='right')
+    # guard against rounding at the upper end
+    samples[samples >= len(prob)] = len(prob) - 1
+    return samples
+
+
+def _sample_chunks_(state, shots, length):
+    '''
+    Draw samples from a state too large for memory, chunk by chunk.
+
+    Shots are shared among chunks by the weight of each chunk, then drawn 
+    inside each chunk. Each chunk is read twice at most.
+
+    -In:
+        state --- qubit state vector.
+            type: numpy.ndarray, complex
+        shots --- number of samples.
+            type: int
+        length --- number of amplitudes in a chunk.
+            type: int
+
+    -Return:
+        samples --- drawn bases, in random order.
+            type: numpy.ndarray, int
+    '''
+    flat = state.view(state.real.dtype)
+    num = len(state) // length
+    weight = zeros(num)
+    for c in range(num):
+        part = flat[2 * c * length:2 * (c + 1) * length]
+        weight[c] = einsum('i,i->', part, part, dtype=float)
+
+    tally = bincount(_sample_(weight, shots), minlength=num)
+    samples = empty(shots, int)
+    k = 0
+    for c in flatnonzero(tally):
+        psi = state[c * length:(c + 1) * length]
+        samples[k:k + tally[c]] = c * length + _sample_(
+            psi.real**2 + psi.imag**2, tally[c])
+        k += tally[c]
+    shuffle(samples)
+    return samples
+
+
+def measure(self, shots=1024, samples=False, qubits=None):
     '''
     Take a measurement on the circuit. 
 
+    Only "qubits" are measured if given. The probability tensor is summed 
+    over other qubits at first, then samples are drawn from the marginal.
+    If the state does not fit in "budget", samples of all qubits are drawn 
+    chunk by chunk, then bits of "qubits" are picked out.
+
     -In:
         shots --- measurement times.
             type: int
+        samples --- return the measured basis of each shot, as integers, 
+            instead of counts.
+            type: bool
+        qubits --- qubits to measure, in the order of output bits. All 
+            qubits by default.
+            type: int, or int sequence
 
     -Return:
         counts --- counts of measurement outputs.
             type: dict
+        or
+        samples --- measured basis of each shot.
+            type: numpy.ndarray, int
     '''
-    prob = zeros(2**self.num_qubits)
-    for i in range(2**self.num_qubits):
-        prob[i] = abs(self.statevector[i])**2
+    if qubits is None:
+        qubits = list(range(self.num_qubits))
+    if type(qubits) is int:
+        qubits = [qubits]
+    qubits = list(qubits)
+    if len(set(qubits)) < len(qubits):
+        raise Exception('Cannot be same qubits.')
+    for i in qubits:
+        if i < 0 or i >= self.num_qubits:
+            raise Exception('Qubit index out of range.')
+
+    psi = self.statevector
+    length = self._chunk_length_()
+    if length < len(psi):
+        full = _sample_chunks_(psi, shots, length)
+        ids = zeros(shots, int)
+        for i in qubits:
+            ids = (ids << 1) | ((full >> (self.num_qubits - 1 - i)) & 1)
+    else:
+        prob = (psi.real**2 + psi.imag**2).reshape([2] * self.num_qubits)
+        others = tuple(i for i in range(self.num_qubits) if i not in qubits)
+        if others:
+            prob = prob.sum(axis=others)
+        # remaining axes are in ascending order of qubits
+        order = sorted(qubits)
+        prob = transpose(prob, [order.index(i) for i in qubits]).reshape(-1)
+        ids = _sample_(prob, shots)
+    if samples:
+        return ids
 
+    tally = bincount(ids)
     counts = {}
-    for i in range(shots):
-        id = choice(arange(2**self.num_qubits), p = prob)
-        basis = format(id, '0%db'%self.num_qubits)
-        if basis in counts:
-            counts[basis] += 1
-        else:
-            counts[basis] = 1
-    return counts
\ No newline at end of file
+    for id in flatnonzero(tally):
+        counts[format(id, '0%db' % len(qubits))] = int(tally[id])
+    return counts
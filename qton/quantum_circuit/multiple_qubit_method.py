@@ -0,0 +1,297 @@
+'''
+path: qton/quantum_circuit/multiple_qubit_method.py
+content:
+
+  function,
+      unitary
+      mch
+      mcx
+      mcy
+      mcz
+      mcs
+      mct
+      mcp
+      mcu
+      mcrx
+      mcry
+      mcrz
+
+'''
+
+from qton.quantum_gate import (H_gate, X_gate, Y_gate, Z_gate, S_gate, T_gate,
+                               P_gate, U_gate, Rx_gate, Ry_gate, Rz_gate,
+                               Unitary_gate)
+from numpy import array, eye, allclose
+
+
+def unitary(self, matrix, qubits):
+    '''
+    Apply a user-supplied unitary on given qubits.
+
+    The matrix is defined on "qubits" in the given order, namely the first 
+    qubit in "qubits" is the leftmost qubit of the matrix basis.
+
+    -In:
+        matrix --- unitary matrix of size 2**len(qubits).
+            type: numpy.ndarray
+        qubits --- target qubits.
+            type: int, or int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    if type(qubits) is int:
+        qubits = [qubits]
+    qubits = list(qubits)
+    if len(set(qubits)) < len(qubits):
+        raise Exception('Cannot be same qubits.')
+    for i in qubits:
+        if i < 0 or i >= self.num_qubits:
+            raise Exception('Qubit index out of range.')
+
+    mat = array(matrix)
+    if mat.shape != (2**len(qubits), 2**len(qubits)):
+        raise Exception('Matrix does not match the number of qubits.')
+    if not allclose(mat @ mat.conj().T, eye(len(mat))):
+        raise Exception('Not a unitary matrix.')
+
+    self._apply_(Unitary_gate(mat), [], qubits)
+
+
+def mch(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled Hadamard operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(H_gate(), ctrl, [targ], ctrl_state)
+
+
+def mcx(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled Pauli-X operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(X_gate(), ctrl, [targ], ctrl_state)
+
+
+def mcy(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled Pauli-Y operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(Y_gate(), ctrl, [targ], ctrl_state)
+
+
+def mcz(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled Pauli-Z operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(Z_gate(), ctrl, [targ], ctrl_state)
+
+
+def mcs(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled S operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(S_gate(), ctrl, [targ], ctrl_state)
+
+
+def mct(self, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled T operation.
+    
+    -In:
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(T_gate(), ctrl, [targ], ctrl_state)
+
+
+def mcp(self, phi, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled phase operation.
+    
+    -In:
+        phi --- phase angle.
+            type: float
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(P_gate(parameters=[phi]), ctrl, [targ], ctrl_state)
+
+
+def mcu(self, theta, phi, lamda, gamma, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled U operation.
+    
+    -In:
+        theta --- amplitude angle.
+            type: float
+        phi --- phase angle 1.
+            type: float
+        lamda --- phase angle 2.
+            type: float
+        gamma --- global phase.
+            type: float
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(
+        U_gate(parameters=[theta, phi, lamda, gamma]), ctrl, [targ],
+        ctrl_state)
+
+
+def mcrx(self, theta, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled rotatin along X axis.
+    
+    -In:
+        theta --- rotation angle.
+            type: float
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(Rx_gate(parameters=[theta]), ctrl, [targ], ctrl_state)
+
+
+def mcry(self, theta, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled rotatin along Y axis.
+    
+    -In:
+        theta --- rotation angle.
+            type: float
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(Ry_gate(parameters=[theta]), ctrl, [targ], ctrl_state)
+
+
+def mcrz(self, theta, ctrl, targ, ctrl_state=None):
+    '''
+    Multi-controlled rotatin along Z axis.
+    
+    -In:
+        theta --- rotation angle.
+            type: float
+        ctrl --- control qubit(s).
+            type: int, or int sequence
+        targ --- target qubit.
+            type: int
+        ctrl_state --- required state of each control qubit, 0 or 1.
+            All controls on |1> by default.
+            type: int sequence
+
+    -Influenced:
+        self.statevector --- qubit state vector.
+            type: numpy.ndarray, complex
+    '''
+    self._apply_(Rz_gate(parameters=[theta]), ctrl, [targ], ctrl_state)
\ No newline at end of file
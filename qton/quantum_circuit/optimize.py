@@ -0,0 +1,195 @@
+'''
+path: qton/quantum_circuit/optimize.py
+content:
+
+  function,
+      _close_
+      _is_identity_
+      _same_qubits_
+      _commute_
+      _merge_
+      optimize
+
+'''
+
+from numpy import eye, kron, allclose, pi
+from qton.quantum_gate import (X_gate, Z_gate, P_gate, Rx_gate, Ry_gate,
+                               Rz_gate, U1_gate)
+from qton.quantum_gate._basic_gate_ import _inverse_
+from .fuse import _full_matrix_
+
+# gates merged by adding up their angles
+_rotation_ = (P_gate, Rx_gate, Ry_gate, Rz_gate, U1_gate)
+
+# number of latest instructions on each qubit to look back
+_window_ = 16
+
+# absolute tolerance of matrix comparisons, keeps the rewrite exact
+_atol_ = 1e-12
+
+
+def _close_(matrix1, matrix2):
+    '''
+    Check if two matrices are equal, up to rounding errors only.
+    '''
+    return allclose(matrix1, matrix2, rtol=0, atol=_atol_)
+
+
+def _is_identity_(gate):
+    '''
+    Check if a gate is the identity.
+
+    A rotation is the identity only if its angle is exactly 0 modulo its 
+    period, 4*pi for a half angle and 2*pi for a phase. Other gates are 
+    compared to the identity matrix.
+    '''
+    if type(gate) in _rotation_:
+        period = 4 * pi if gate.half_angles[0] else 2 * pi
+        return gate.parameters[0] % period == 0
+    return _close_(gate.matrix, eye(len(gate.matrix)))
+
+
+def _same_qubits_(instruction1, instruction2):
+    '''
+    Check if two instructions act on the same qubits in the same way.
+    '''
+    ctrl1, targ1, state1 = instruction1[1:]
+    ctrl2, targ2, state2 = instruction2[1:]
+    if state1 is None:
+        state1 = (1, ) * len(ctrl1)
+    if state2 is None:
+        state2 = (1, ) * len(ctrl2)
+    return ctrl1 == ctrl2 and targ1 == targ2 and state1 == state2
+
+
+def _commute_(instruction1, instruction2):
+    '''
+    Check if two instructions commute, by a sufficient condition.
+
+    On each shared qubit, both instructions should commute with a same 
+    Pauli operator, Z or X. Then both are block diagonal in a same basis of 
+    shared qubits, with blocks acting on different qubits.
+
+    -In:
+        instruction1 --- (gate, ctrl, targ, ctrl_state).
+            type: tuple
+        instruction2 --- (gate, ctrl, targ, ctrl_state).
+            type: tuple
+
+    -Out:
+        flag --- whether they commute.
+            type: bool
+    '''
+    matrix1, qubits1 = _full_matrix_(instruction1)
+    matrix2, qubits2 = _full_matrix_(instruction2)
+
+    def commute_with(matrix, qubits, q, pauli):
+        op = eye(1)
+        for i in qubits:
+            op = kron(op, pauli if i == q else eye(2))
+        return _close_(matrix @ op, op @ matrix)
+
+    for q in set(qubits1) & set(qubits2):
+        for pauli in (Z_gate.matrix, X_gate.matrix):
+            if (commute_with(matrix1, qubits1, q, pauli)
+                    and commute_with(matrix2, qubits2, q, pauli)):
+                break
+        else:
+            return False
+    return True
+
+
+def _merge_(instruction1, instruction2):
+    '''
+    Merge two rotations of the same axis on the same qubits.
+
+    -Out:
+        merged --- merged instruction, None if not mergeable.
+            type: tuple
+    '''
+    gate1, gate2 = instruction1[0], instruction2[0]
+    if type(gate1) is not type(gate2) or type(gate1) not in _rotation_:
+        return None
+    angle = 0
+    for gate in (gate1, gate2):
+        angle += -gate.parameters[0] if gate.inverse else gate.parameters[0]
+    return (type(gate1)(parameters=[angle]), ) + instruction1[1:]
+
+
+def optimize(self):
+    '''
+    Peephole optimization on pending instructions.
+
+    Identity gates are dropped, such as "i" and rotations of zero angle. 
+    For each instruction, look back across the instructions it commutes 
+    with. An inverse pair on the same qubits is cancelled, two rotations 
+    of the same axis on the same qubits are merged. Stacked matrices of a 
+    batch are kept, and nothing is moved across them.
+    Matrices are compared up to rounding errors only, so the optimized 
+    instructions give the same state.
+
+    This works on "self.instructions", thus makes sense in deferred mode.
+
+    -Influenced:
+        self.instructions --- pending instructions, optimized.
+            type: list
+
+    -Return:
+        report --- number of instructions before and after optimization, 
+            and number of passes saved.
+            type: dict
+    '''
+    out = []
+    on = {}  # indices in "out" of instructions on each qubit
+
+    for instruction in self.instructions:
+        gate, ctrl, targ, ctrl_state = instruction
+        qubits = ctrl + targ
+        candidates = set()
+        if gate.matrix.ndim == 2:
+            if _is_identity_(gate):
+                continue
+            # an older candidate might pass uninspected instructions just 
+            # out of the window of another qubit, thus is dropped
+            bound = -1
+            for i in qubits:
+                history = on.get(i, [])
+                candidates.update(history[-_window_:])
+                if len(history) > _window_:
+                    bound = max(bound, history[-_window_ - 1])
+            candidates = set(k for k in candidates if k > bound)
+
+        for k in sorted(candidates, reverse=True):
+            prior = out[k]
+            if prior is None:
+                continue
+            if prior[0].matrix.ndim > 2:
+                break
+            if _same_qubits_(prior, instruction):
+                if _close_(_inverse_(prior[0].matrix), gate.matrix):
+                    out[k] = None
+                    instruction = None
+                    break
+                merged = _merge_(prior, instruction)
+                if merged is not None:
+                    out[k] = merged
+                    if _is_identity_(merged[0]):
+                        out[k] = None
+                    instruction = None
+                    break
+            if not _commute_(prior, instruction):
+                break
+
+        if instruction is not None:
+            out.append(instruction)
+            for i in qubits:
+                on.setdefault(i, []).append(len(out) - 1)
+
+    instructions = [i for i in out if i is not None]
+    report = {
+        'before': len(self.instructions),
+        'after': len(instructions),
+        'saved': len(self.instructions) - len(instructions),
+    }
+    self.instructions = instructions
+    return report
@@ -9,7 +9,13 @@ content:
 
 __all__ = ['Quantum_circuit']
 
-from numpy import zeros, sqrt, matmul
+from concurrent.futures import ThreadPoolExecutor
+from numpy import (zeros, reshape, diagonal, argmax, matmul, asarray, memmap,
+                   dtype as _dtype_)
+from qton.quantum_gate._basic_gate_ import _is_diagonal_, _is_permutation_
+from ._index_plan_ import _Plan_cache_
+from ._scratch_pool_ import _Scratch_pool_
+from ._process_engine_ import _Process_engine_
 
 
 class Quantum_circuit(object):
@@ -34,22 +40,86 @@ class Quantum_circuit(object):
             qc.statevector
             
         Take a measurement on the instance, on qubit 2 and 3:
-            observe = qc.measure([2, 3])
+            observe = qc.measure(qubits=[2, 3])
         Which retruns a count of basis.
+
+        Create an instance in deferred mode:
+            qc = Quantum_circuit(num_qubits, deferred=True)
+        Gate methods only record instructions in "qc.instructions", which 
+        are executed when "qc.statevector" is invoked, or by "qc.execute()".
+
+        Create an instance with the state in a file on disk, and at most 
+        1 GB of memory for kernels:
+            qc = Quantum_circuit(num_qubits, deferred=True, 
+                                 filename='state.dat', budget=2**30)
+
+        Create an instance running kernels on 8 threads:
+            qc = Quantum_circuit(num_qubits, num_workers=8)
+        Or on 8 processes, with the state in shared memory:
+            qc = Quantum_circuit(num_qubits, deferred=True, 
+                                 backend='process', num_workers=8)
+
+        Optimize and fuse pending instructions before execution:
+            report = qc.optimize()
+            report = qc.fuse()
+
+        Create an instance in single precision, to halve the memory:
+            qc = Quantum_circuit(num_qubits, dtype=numpy.complex64)
+
+        Create an instance with 2 classical bits:
+            qc = Quantum_circuit(num_qubits, num_clbits=2)
+        Measure qubit 0 into classical bit 1, the state collapses:
+            qc.collapse(0, 1)
+        Apply X on qubit 2 if classical bit 1 reads 1:
+            with qc.condition(1, 1):
+                qc.x(2)
+
+        Exact expectation value of a Pauli string, or a Pauli sum:
+            value = qc.expectation('XIZ')
+            value = qc.expectation({'ZZI': 0.5, 'IXX': -1.2})
+
+        Gradient of an expectation value over all parameters:
+            grad = qc.gradient(observable)
+        Or by adjoint differentiation, with fewer passes and less memory:
+            grad = qc.adjoint_gradient(observable)
     '''
     num_qubits = 0
-    statevector = None
+    deferred = False
+    instructions = None
+    clbits = None
+    dtype = _dtype_(complex)
+    budget = None
+    num_workers = 1
+    backend = 'thread'
+    engine = None
+    scratch = None
+    _executor_ = None
+    _statevector_ = None
+    _skip_ = False
+
+    # index plans are shared by all circuits
+    plan_cache = _Plan_cache_()
 
     from .initialize import initialize
     from .measure import measure
+    from .collapse import collapse, condition
+    from .fuse import fuse
+    from .optimize import optimize
+    from .expectation import expectation
+    from .gradient import gradient
+    from .adjoint import adjoint_gradient
     from .single_qubit_method import (i, h, x, y, z, s, sdg, t, tdg, p, u, rx,
                                       ry, rz, u1, u2, u3)
     from .double_qubit_method import (swap, ch, cx, cy, cz, cs, ct, cp, cu,
                                       crx, cry, crz, cu1, cu2, cu3)
     from .triple_qubit_method import (cswap, cch, ccx, ccy, ccz, ccs, cct, ccp,
                                       ccu, ccrx, ccry, ccrz)
+    from .multiple_qubit_method import (unitary, mch, mcx, mcy, mcz, mcs, mct,
+                                        mcp, mcu, mcrx, mcry, mcrz)
 
-    def __init__(self, num_qubits=0):
+    def __init__(self, num_qubits=0, deferred=False, num_clbits=0,
+                 dtype=complex, filename=None, budget=None, num_workers=1,
+                 backend='thread'):
         '''
         
         Circuit starts from |0...0> state by default.
@@ -57,17 +127,282 @@ class Quantum_circuit(object):
         -In:
             num_qubits --- number of qubits.
                 type: int
+            deferred --- record gates as instructions instead of applying 
+                them immediately.
+                type: bool
+            num_clbits --- number of classical bits.
+                type: int
+            dtype --- precision of the state, complex64 or complex128.
+                type: numpy.dtype
+            filename --- keep the state in this file as a memory map, 
+                instead of in memory.
+                type: str
+            budget --- bytes of memory for chunks and scratch buffers of 
+                kernels. The state is streamed chunk by chunk if it does 
+                not fit in.
+                type: int
+            num_workers --- number of threads, or processes, to run 
+                kernels.
+                type: int
+            backend --- 'thread' runs kernels on threads of this process, 
+                'process' keeps the state in shared memory and runs 
+                kernels on worker processes.
+                type: str
         
         -Influenced:
             self.num_qubits --- number of qubits.
                 type: int
+            self.deferred --- deferred mode or not.
+                type: bool
+            self.instructions --- pending instructions.
+                type: list
+            self.clbits --- classical bits, all 0 at first.
+                type: list
+            self.dtype --- precision of the state.
+                type: numpy.dtype
+            self.budget --- bytes of memory for kernels.
+                type: int
+            self.num_workers --- number of threads, or processes, to run 
+                kernels.
+                type: int
+            self.backend --- 'thread' or 'process'.
+                type: str
+            self.engine --- worker processes of the 'process' backend.
+                type: _Process_engine_
+            self.scratch --- scratch buffers of kernels.
+                type: _Scratch_pool_
             self.statevector --- qubit state vector.
-                type: numpy.ndarray, complex
+                type: numpy.ndarray, or numpy.memmap, complex
         '''
         self.num_qubits = num_qubits
-        self.statevector = zeros(2**num_qubits, complex)
+        self.deferred = deferred
+        self.instructions = []
+        self.clbits = [0] * num_clbits
+        self.dtype = self._precision_(dtype)
+        self.budget = budget
+        self.num_workers = num_workers
+        if backend not in ('thread', 'process'):
+            raise Exception('Backend should be thread or process.')
+        self.backend = backend
+        if budget is None:
+            self.scratch = _Scratch_pool_()
+        else:
+            # half for chunks of the state, half for scratch buffers
+            self.scratch = _Scratch_pool_(budget // 2 // self.dtype.itemsize)
+        if backend == 'process':
+            if filename is not None:
+                raise Exception('Process backend keeps the state in shared '
+                                'memory, not in a file.')
+            self.engine = _Process_engine_(num_qubits, self.dtype,
+                                           num_workers)
+            self.statevector = self.engine.statevector
+        elif filename is None:
+            self.statevector = zeros(2**num_qubits, self.dtype)
+        else:
+            self.statevector = memmap(filename, self.dtype, 'w+',
+                                      shape=(2**num_qubits, ))
         self.statevector[0] = 1.0
 
+    @staticmethod
+    def _precision_(dtype):
+        '''
+        Check the precision of a state.
+
+        -In:
+            dtype --- complex64 or complex128.
+                type: numpy.dtype
+
+        -Return:
+            dtype --- checked precision.
+                type: numpy.dtype
+        '''
+        dtype = _dtype_(dtype)
+        if dtype not in (_dtype_('complex64'), _dtype_('complex128')):
+            raise Exception('Precision should be complex64 or complex128.')
+        return dtype
+
+    @property
+    def statevector(self):
+        '''
+        Qubit state vector. Pending instructions are executed before return.
+        '''
+        if self.instructions:
+            self.execute()
+        return self._statevector_
+
+    @statevector.setter
+    def statevector(self, statevector):
+        self._statevector_ = statevector
+
+    def execute(self):
+        '''
+        Execute all pending instructions in order.
+
+        If the state does not fit in "budget", it is streamed in chunks 
+        of its leading qubits. Runs of instructions with all targets out of 
+        the leading qubits are grouped, each chunk is read and written once 
+        for a group. Others are applied on the whole state.
+
+        With the 'process' backend, instructions are run by its engine.
+
+        -Influenced:
+            self.instructions --- pending instructions, emptied.
+                type: list
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        instructions, self.instructions = self.instructions, []
+        if self.engine is not None:
+            self.engine.execute(self, instructions)
+            return
+        length = self._chunk_length_()
+        m = self.num_qubits - (length.bit_length() - 1)  # leading qubits
+        group = []
+        for gate, ctrl, targ, ctrl_state in instructions:
+            if m == 0:
+                self._controlled_manipulation_(gate.matrix, ctrl, targ,
+                                               ctrl_state)
+            elif min(targ) >= m:
+                group.append((gate, ctrl, targ, ctrl_state))
+            else:
+                self._stream_(group, m)
+                group = []
+                self._controlled_manipulation_(gate.matrix, ctrl, targ,
+                                               ctrl_state)
+        self._stream_(group, m)
+
+    def _chunk_length_(self):
+        '''
+        Number of amplitudes in a chunk of the state, a power of 2.
+        The whole state if no budget is set, or it fits in.
+
+        -Return:
+            length --- number of amplitudes.
+                type: int
+        '''
+        length = 2**self.num_qubits
+        if self.budget is not None:
+            limit = self.budget // 2 // self.dtype.itemsize
+            while length > 1 and length > limit:
+                length //= 2
+        return length
+
+    def _stream_(self, group, m):
+        '''
+        Apply a group of instructions on the state, chunk by chunk.
+
+        Each chunk fixes the leading "m" qubits, and is copied into a local 
+        circuit of the other qubits. Controls on leading qubits are checked 
+        against the chunk, other qubits are shifted by "m".
+
+        -In:
+            group --- instructions with all targets out of leading qubits.
+                type: list
+            m --- number of leading qubits.
+                type: int
+
+        -Influenced:
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        if not group:
+            return
+
+        state = self.statevector
+        local = Quantum_circuit(self.num_qubits - m, dtype=self.dtype,
+                                num_workers=self.num_workers)
+        local.scratch = self.scratch
+        local._executor_ = self._executor_
+        chunk = local.statevector
+        for c in range(2**m):
+            bits = [int(b) for b in format(c, '0%db' % m)]
+            chunk[:] = state[c * len(chunk):(c + 1) * len(chunk)]
+            for instruction in group:
+                instruction = self._localize_(instruction, bits)
+                if instruction is not None:
+                    local._controlled_manipulation_(*instruction)
+            state[c * len(chunk):(c + 1) * len(chunk)] = chunk
+
+    @staticmethod
+    def _localize_(instruction, bits):
+        '''
+        Turn an instruction on the whole state into one on a chunk.
+
+        A chunk fixes the leading qubits to "bits". Controls on leading 
+        qubits are checked against the chunk, other qubits are shifted by 
+        the number of leading qubits.
+
+        -In:
+            instruction --- (gate, ctrl, targ, ctrl_state), with all 
+                targets out of leading qubits.
+                type: tuple
+            bits --- values of leading qubits in the chunk.
+                type: int sequence
+
+        -Return:
+            local --- (matrix, ctrl, targ, ctrl_state) on the chunk, or 
+                None if a control on leading qubits does not hold.
+                type: tuple
+        '''
+        gate, ctrl, targ, ctrl_state = instruction
+        m = len(bits)
+        if ctrl_state is None:
+            ctrl_state = (1, ) * len(ctrl)
+        if any(i < m and bits[i] != b for i, b in zip(ctrl, ctrl_state)):
+            return None
+        rest = [(i - m, b) for i, b in zip(ctrl, ctrl_state) if i >= m]
+        local = (gate.matrix, tuple(i for i, _ in rest),
+                 tuple(i - m for i in targ), tuple(b for _, b in rest))
+        return local
+
+    def _apply_(self, gate, ctrl, targ, ctrl_state=None):
+        '''
+        Apply a gate on given qubits, or record it in deferred mode.
+
+        This is an internal method, all gate methods end up here.
+        An instruction is a tuple (gate, ctrl, targ, ctrl_state).
+
+        -In:
+            gate --- base gate, without any controls added.
+                type: qton.quantum_gate._basic_gate_._Basic_gate_
+            ctrl --- control qubit(s), could be empty.
+                type: int, or int sequence
+            targ --- target qubits.
+                type: int sequence
+            ctrl_state --- required state of each control qubit, 0 or 1.
+                All controls on |1> by default.
+                type: int sequence
+
+        -Influenced:
+            self.instructions --- pending instructions.
+                type: list
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        if type(ctrl) is int:
+            ctrl = [ctrl]
+        ctrl = tuple(ctrl)
+        targ = tuple(targ)
+        if len(set(ctrl + targ)) < len(ctrl + targ):
+            raise Exception('Cannot be same qubits.')
+        for i in ctrl + targ:
+            if i < 0 or i >= self.num_qubits:
+                raise Exception('Qubit index out of range.')
+        if ctrl_state is not None:
+            ctrl_state = tuple(ctrl_state)
+            if len(ctrl_state) != len(ctrl) or set(ctrl_state) - {0, 1}:
+                raise Exception('Invalid control state.')
+
+        if self._skip_:
+            # inside a condition that does not hold
+            return
+        if self.deferred:
+            self.instructions.append((gate, ctrl, targ, ctrl_state))
+        elif self.engine is not None:
+            self.engine.execute(self, [(gate, ctrl, targ, ctrl_state)])
+        else:
+            self._controlled_manipulation_(gate.matrix, ctrl, targ, ctrl_state)
+
     def _inner_swap_(self, qubit1, qubit2):
         '''
         Swap two qubits.
@@ -97,51 +432,19 @@ class Quantum_circuit(object):
         if qubit1 == qubit2:
             return None
 
-        # "q1" should be on left side of "q2"
-        # the left qubit has smaller index
-        if qubit2 < qubit1:
-            q1 = qubit2
-            q2 = qubit1
-        else:
-            q1 = qubit1
-            q2 = qubit2
-
-        # set location of qubit digits
-        # counts digit from right to left
-        x1 = self.num_qubits - q1 - 1  # location of "q1"
-        x2 = self.num_qubits - q2 - 1  # location of "q2"
-
-        # weight of location
-        w1 = 2**x1
-        w2 = 2**x2
-
-        old_statevector = self.statevector.copy()
-        for i in range(2**self.num_qubits):
-            # digits for "q1" and "q2"
-            a = i & w1
-            b = i & w2
-            if a >> x1 != b >> x2:
-                # if two digits are not same
-                # switch them
-                tmp1 = 2**64 - 1 - w1 - w2  # 64 means we support switch between at most 63 qubits
-                delta = x1 - x2
-                tmp2 = (b << delta) + (a >> delta)
-                j = i & tmp1 | tmp2
-                self.statevector[i] = old_statevector[j]
+        # moves whole strided views, in place
+        self._permutation_manipulation_([0, 2, 1, 3], (), (qubit1, qubit2))
 
     def _single_qubit_manipulatoin_(self, gate, targ):
         '''
         Apply a single-qubit gate on given qubits. 
         
-        This is an internal method based on another internal method "_inner_swap_".
-
-        First swap the target qubit with the rightmost qubit.
-        Apply the gate on the rightmost qubit, then swap back.
+        This is an internal method, a wrapper of "_apply_".
         Target could be a sequence of qubits.  
 
         -In:
-            gate --- single-qubit gate matrix.
-                type: numpy.ndarray
+            gate --- single-qubit gate.
+                type: qton.quantum_gate._basic_gate_._Basic_gate_
             targ --- target qubit(s).
                 type: int, or int sequence
 
@@ -154,26 +457,19 @@ class Quantum_circuit(object):
         else:
             targ = list(set(targ))
 
-        num_basis = 2**self.num_qubits
         for i in targ:
-            self._inner_swap_(i, self.num_qubits - 1)
-            for j in range(0, num_basis, 2):
-                self.statevector[j:j + 2] = matmul(gate,
-                                                   self.statevector[j:j + 2])
-            self._inner_swap_(i, self.num_qubits - 1)
+            self._apply_(gate, [], [i])
 
     def _double_qubit_manipulation_(self, gate, qubit1, qubit2):
         '''
         Apply a double-qubit gate on two given qubits. 
         
-        This is an internal method. "qubit1" and "qubit2" can only be scalars.
-        
-        Find out which 4 elements in state vector vary simultaneously.
-        Multiply the gate matrix on them.
+        This is an internal method, a wrapper of "_apply_". 
+        "qubit1" and "qubit2" can only be scalars.
 
         -In:
-            gate --- double-qubit gate matrix.
-                type: numpy.ndarray
+            gate --- double-qubit gate.
+                type: qton.quantum_gate._basic_gate_._Basic_gate_
             qubit1 --- usually the control qubit.
                 type: int
             qubit2 --- usually the target qubit.
@@ -186,39 +482,18 @@ class Quantum_circuit(object):
         if qubit1 == qubit2:
             raise Exception('Cannot be same qubits.')
 
-        reg = [qubit2, qubit1]
-        q = list(set(range(self.num_qubits)) - set(reg))
-        q.sort(reverse=True)
-
-        wgt = [2**(self.num_qubits - i - 1) for i in reg + q]
-        x = 0
-        l = list(range(2**self.num_qubits))
-        for i in range(1, 2**self.num_qubits - 1):
-            for j in range(self.num_qubits):
-                if i % (2**j) == 0: x ^= wgt[j]
-            l[i] = x
-        for i in range(0, 2**self.num_qubits, 4):
-            vec = matmul(gate, [
-                self.statevector[l[i]],
-                self.statevector[l[i + 1]],
-                self.statevector[l[i + 2]],
-                self.statevector[l[i + 3]],
-            ])
-            for j in range(4):
-                self.statevector[l[i + j]] = vec[j]
+        self._apply_(gate, [], [qubit1, qubit2])
 
     def _triple_qubit_manipulation_(self, gate, qubit1, qubit2, qubit3):
         '''
         Apply a triple-qubit gate on three given qubits. 
         
-        This is an internal method. "qubit1", "qubit2" and "qubit3" can only be scalars. 
-
-        Find out which 8 elements in state vector vary simultaneously.
-        Multiply the gate matrix on them.
+        This is an internal method, a wrapper of "_apply_". 
+        "qubit1", "qubit2" and "qubit3" can only be scalars. 
 
         -In:
-            gate --- triple-qubit gate matrix.
-                type: numpy.ndarray
+            gate --- triple-qubit gate.
+                type: qton.quantum_gate._basic_gate_._Basic_gate_
             qubit1 --- usually the first control qubit.
                 type: int
             qubit2 --- usually the second control qubit.
@@ -233,23 +508,220 @@ class Quantum_circuit(object):
         if len({qubit1, qubit2, qubit3}) < 3:
             raise Exception('Should be 3 different qubits.')
 
-        reg = [qubit3, qubit2, qubit1]
-        q = list(set(range(self.num_qubits)) - set(reg))
-        q.sort(reverse=True)
-
-        wgt = [2**(self.num_qubits - i - 1) for i in reg + q]
-        x = 0
-        l = list(range(2**self.num_qubits))
-        for i in range(1, 2**self.num_qubits - 1):
-            for j in range(self.num_qubits):
-                if i % (2**j) == 0: x ^= wgt[j]
-            l[i] = x
-        for i in range(0, 2**self.num_qubits, 8):
-            vec = matmul(gate, [
-                self.statevector[l[i]], self.statevector[l[i + 1]],
-                self.statevector[l[i + 2]], self.statevector[l[i + 3]],
-                self.statevector[l[i + 4]], self.statevector[l[i + 5]],
-                self.statevector[l[i + 6]], self.statevector[l[i + 7]]
-            ])
-            for j in range(8):
-                self.statevector[l[i + j]] = vec[j]
\ No newline at end of file
+        self._apply_(gate, [], [qubit1, qubit2, qubit3])
+
+    def _parallel_(self, work, chunks):
+        '''
+        Run a kernel over chunks of the state, on "num_workers" threads.
+
+        This is an internal method.
+
+        Chunks are disjoint, and NumPy releases the GIL while copying and 
+        multiplying large arrays, thus the threads run in parallel. Worker 
+        "w" takes every "num_workers"-th chunk from the "w"-th, with its own 
+        scratch buffers.
+
+        -In:
+            work --- kernel on a chunk, takes (chunk, worker index).
+                type: function
+            chunks --- indices of chunks.
+                type: iterable of tuples
+        '''
+        chunks = list(chunks)
+        num = min(self.num_workers, len(chunks))
+        if num <= 1:
+            for chunk in chunks:
+                work(chunk, 0)
+            return
+
+        if self._executor_ is None:
+            self._executor_ = ThreadPoolExecutor(self.num_workers)
+
+        def run(w):
+            for chunk in chunks[w::num]:
+                work(chunk, w)
+
+        # collect results to raise errors from workers
+        list(self._executor_.map(run, range(num)))
+
+    def _controlled_manipulation_(self, gate, ctrl, targ, ctrl_state=None):
+        '''
+        Apply a gate on any number of target qubits, with any number of 
+        controls. 
+        
+        This is an internal method, the kernel behind "_apply_". 
+        The gate is given by its base matrix, without any controls added.
+
+        View the state vector as a tensor with one axis per qubit.
+        Fix all control axes to their required states, |1> by default, and 
+        fix the target axes to each of their bases, which gives one view for 
+        each basis of target qubits. The views are described by an index 
+        plan from "plan_cache". Amplitudes of these views are gathered into 
+        a scratch buffer, multiplied by the base gate matrix, and written 
+        back in place. Large views are done chunk by chunk, thus the scratch 
+        is bounded. The other amplitudes are untouched.
+
+        A batch of state vectors is kept in one array, with a leading batch 
+        axis. The gate could be a stack of matrices, one for each state. 
+        Gate matrices are taken in the precision of the state.
+
+        -In:
+            gate --- base gate matrix, or a stack of base gate matrices.
+                type: numpy.ndarray
+            ctrl --- control qubits, could be empty.
+                type: int sequence
+            targ --- target qubits.
+                type: int sequence
+            ctrl_state --- required state of each control qubit, 0 or 1.
+                type: int sequence
+
+        -Influenced:
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        gate = asarray(gate, self.statevector.dtype)
+        if _is_diagonal_(gate):
+            return self._diagonal_manipulation_(diagonal(gate, 0, -2, -1),
+                                                ctrl, targ, ctrl_state)
+        if _is_permutation_(gate):
+            return self._permutation_manipulation_(argmax(gate, axis=1), ctrl,
+                                                   targ, ctrl_state)
+
+        state = self.statevector
+        psi = state.reshape(state.shape[:-1] + (2, ) * self.num_qubits)
+        bases = self.plan_cache.get(self.num_qubits, ctrl, targ,
+                                    ctrl_state)[1]
+        views = [psi[b] for b in bases]
+
+        # batch axes lead, then bases of targets, then the rest
+        # a stack of matrices multiplies its own state in the batch
+        lead = (slice(None), ) * (state.ndim - 1)
+        d = len(views)
+        flat = state.shape[:-1] + (d, -1)
+
+        def work(chunk, w):
+            parts = [v[chunk] for v in views]
+            shape = state.shape[:-1] + (d, ) + parts[0].shape[state.ndim - 1:]
+            buf = self.scratch.get('in%d' % w, shape, state.dtype)
+            out = self.scratch.get('out%d' % w, shape, state.dtype)
+            for j in range(d):
+                buf[lead + (j, )] = parts[j]
+            matmul(gate, buf.reshape(flat), out=out.reshape(flat))
+            for j in range(d):
+                parts[j][...] = out[lead + (j, )]
+
+        self._parallel_(
+            work,
+            self.scratch.chunks(views[0].shape, state.ndim - 1,
+                                2 * d * self.num_workers, self.num_workers))
+
+    def _diagonal_manipulation_(self, diagonal, ctrl, targ,
+                                ctrl_state=None):
+        '''
+        Apply a (controlled) diagonal gate on given qubits. 
+        
+        This is an internal method.
+
+        A diagonal gate only multiplies a phase on each basis of target 
+        qubits. For each basis, fix the control axes to their required 
+        states, |1> by default, and fix the target axes to this basis, then 
+        multiply the phase in place on this view.
+        Bases with unit phase are skipped.
+
+        -In:
+            diagonal --- diagonal elements of the base gate matrix, or of a 
+                stack of base gate matrices.
+                type: numpy.ndarray
+            ctrl --- control qubits.
+                type: int sequence
+            targ --- target qubits.
+                type: int sequence
+            ctrl_state --- required state of each control qubit, 0 or 1.
+                type: int sequence
+
+        -Influenced:
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        state = self.statevector
+        psi = state.reshape(state.shape[:-1] + (2, ) * self.num_qubits)
+        bases = self.plan_cache.get(self.num_qubits, ctrl, targ,
+                                    ctrl_state)[1]
+
+        phases = [(j, diagonal[..., j]) for j in range(diagonal.shape[-1])
+                  if not (diagonal[..., j] == 1).all()]
+        views = [psi[b] for b in bases]
+
+        # no scratch is used, chunks are only split for workers
+        def work(chunk, w):
+            for j, phase in phases:
+                part = views[j][chunk]
+                # phases of a batch are broadcast over the other axes
+                part *= reshape(phase,
+                                phase.shape + (1, ) * (part.ndim - phase.ndim))
+
+        self._parallel_(
+            work,
+            self.scratch.chunks(views[0].shape, state.ndim - 1, 0,
+                                self.num_workers))
+
+    def _permutation_manipulation_(self, permutation, ctrl, targ,
+                                   ctrl_state=None):
+        '''
+        Apply a (controlled) permutation gate on given qubits. 
+        
+        This is an internal method.
+
+        A permutation gate only moves amplitudes between bases of target 
+        qubits, no arithmetic is needed. The amplitudes of basis "j" come 
+        from basis "permutation[j]". With control axes fixed to their 
+        required states, |1> by default, follow each cycle of the 
+        permutation and move whole strided views in place. For each cycle, 
+        one view is copied aside into a scratch buffer, chunk by chunk.
+
+        -In:
+            permutation --- source basis of each basis of target qubits.
+                type: int sequence
+            ctrl --- control qubits.
+                type: int sequence
+            targ --- target qubits.
+                type: int sequence
+            ctrl_state --- required state of each control qubit, 0 or 1.
+                type: int sequence
+
+        -Influenced:
+            self.statevector --- qubit state vector.
+                type: numpy.ndarray, complex
+        '''
+        state = self.statevector
+        psi = state.reshape(state.shape[:-1] + (2, ) * self.num_qubits)
+        bases = self.plan_cache.get(self.num_qubits, ctrl, targ,
+                                    ctrl_state)[1]
+
+        cycles = []
+        done = [False] * len(permutation)
+        for j in range(len(permutation)):
+            if done[j] or permutation[j] == j:
+                continue
+            cycle = [j]
+            while permutation[cycle[-1]] != j:
+                cycle.append(permutation[cycle[-1]])
+            for k in cycle:
+                done[k] = True
+            cycles.append(cycle)
+
+        views = [psi[b] for b in bases]
+
+        def work(chunk, w):
+            parts = [v[chunk] for v in views]
+            tmp = self.scratch.get('in%d' % w, parts[0].shape, state.dtype)
+            for cycle in cycles:
+                tmp[...] = parts[cycle[0]]
+                for k, l in zip(cycle[:-1], cycle[1:]):
+                    parts[k][...] = parts[l]
+                parts[cycle[-1]][...] = tmp
+
+        self._parallel_(
+            work,
+            self.scratch.chunks(views[0].shape, state.ndim - 1,
+                                self.num_workers, self.num_workers))
\ No newline at end of file
@@ -47,7 +47,7 @@ def i(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(I_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(I_gate(), targ)
 
 
 def h(self, targ):
@@ -69,7 +69,7 @@ def h(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(H_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(H_gate(), targ)
 
 
 def x(self, targ):
@@ -91,7 +91,7 @@ def x(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(X_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(X_gate(), targ)
 
 
 def y(self, targ):
@@ -113,7 +113,7 @@ def y(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(Y_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(Y_gate(), targ)
 
 
 def z(self, targ):
@@ -135,7 +135,7 @@ def z(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(Z_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(Z_gate(), targ)
 
 
 def s(self, targ):
@@ -157,7 +157,7 @@ def s(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(S_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(S_gate(), targ)
 
 
 def sdg(self, targ):
@@ -179,7 +179,7 @@ def sdg(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(S_gate(inverse=True).matrix, targ)
+    self._single_qubit_manipulatoin_(S_gate(inverse=True), targ)
 
 
 def t(self, targ):
@@ -201,7 +201,7 @@ def t(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(T_gate.matrix, targ)
+    self._single_qubit_manipulatoin_(T_gate(), targ)
 
 
 def tdg(self, targ):
@@ -223,7 +223,7 @@ def tdg(self, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(T_gate(inverse=True).matrix, targ)
+    self._single_qubit_manipulatoin_(T_gate(inverse=True), targ)
 
 
 def p(self, phi, targ):
@@ -247,7 +247,7 @@ def p(self, phi, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(P_gate(parameters=[phi]).matrix, targ)
+    self._single_qubit_manipulatoin_(P_gate(parameters=[phi]), targ)
 
 
 def u(self, theta, phi, lamda, gamma, targ):
@@ -278,7 +278,7 @@ def u(self, theta, phi, lamda, gamma, targ):
             type: numpy.ndarray, complex
     '''
     self._single_qubit_manipulatoin_(
-        U_gate(parameters=[theta, phi, lamda, gamma]).matrix, targ)
+        U_gate(parameters=[theta, phi, lamda, gamma]), targ)
 
 
 def rx(self, theta, targ):
@@ -303,7 +303,7 @@ def rx(self, theta, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(Rx_gate(parameters=[theta]).matrix, targ)
+    self._single_qubit_manipulatoin_(Rx_gate(parameters=[theta]), targ)
 
 
 def ry(self, theta, targ):
@@ -328,7 +328,7 @@ def ry(self, theta, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(Ry_gate(parameters=[theta]).matrix, targ)
+    self._single_qubit_manipulatoin_(Ry_gate(parameters=[theta]), targ)
 
 
 def rz(self, theta, targ):
@@ -353,7 +353,7 @@ def rz(self, theta, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(Rz_gate(parameters=[theta]).matrix, targ)
+    self._single_qubit_manipulatoin_(Rz_gate(parameters=[theta]), targ)
 
 
 def u1(self, lamda, targ):
@@ -377,7 +377,7 @@ def u1(self, lamda, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(U1_gate(parameters=[lamda]).matrix, targ)
+    self._single_qubit_manipulatoin_(U1_gate(parameters=[lamda]), targ)
 
 
 def u2(self, phi, lamda, targ):
@@ -403,8 +403,7 @@ def u2(self, phi, lamda, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._single_qubit_manipulatoin_(
-        U2_gate(parameters=[phi, lamda]).matrix, targ)
+    self._single_qubit_manipulatoin_(U2_gate(parameters=[phi, lamda]), targ)
 
 
 def u3(self, theta, phi, lamda, targ):
@@ -433,4 +432,4 @@ def u3(self, theta, phi, lamda, targ):
             type: numpy.ndarray, complex
     '''
     self._single_qubit_manipulatoin_(
-        U3_gate(parameters=[theta, phi, lamda]).matrix, targ)
+        U3_gate(parameters=[theta, phi, lamda]), targ)
@@ -39,8 +39,7 @@ def cswap(self, ctrl, qubit1, qubit2):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Swap_gate(num_ctrl=1).matrix, ctrl, qubit1, qubit2)
+    self._apply_(Swap_gate(), [ctrl], [qubit1, qubit2])
 
 
 def cch(self, ctrl1, ctrl2, targ):
@@ -59,8 +58,7 @@ def cch(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        H_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(H_gate(), [ctrl1, ctrl2], [targ])
 
 
 def ccx(self, ctrl1, ctrl2, targ):
@@ -79,8 +77,7 @@ def ccx(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        X_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(X_gate(), [ctrl1, ctrl2], [targ])
 
 
 def ccy(self, ctrl1, ctrl2, targ):
@@ -99,8 +96,7 @@ def ccy(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Y_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(Y_gate(), [ctrl1, ctrl2], [targ])
 
 
 def ccz(self, ctrl1, ctrl2, targ):
@@ -119,8 +115,7 @@ def ccz(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Z_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(Z_gate(), [ctrl1, ctrl2], [targ])
 
 
 def ccs(self, ctrl1, ctrl2, targ):
@@ -139,8 +134,7 @@ def ccs(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        S_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(S_gate(), [ctrl1, ctrl2], [targ])
 
 
 def cct(self, ctrl1, ctrl2, targ):
@@ -159,8 +153,7 @@ def cct(self, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        T_gate(num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(T_gate(), [ctrl1, ctrl2], [targ])
 
 
 def ccp(self, phi, ctrl1, ctrl2, targ):
@@ -181,8 +174,7 @@ def ccp(self, phi, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        P_gate(parameters=[phi], num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(P_gate(parameters=[phi]), [ctrl1, ctrl2], [targ])
 
 
 def ccu(self, theta, phi, lamda, gamma, ctrl1, ctrl2, targ):
@@ -209,9 +201,8 @@ def ccu(self, theta, phi, lamda, gamma, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        U_gate(parameters=[theta, phi, lamda, gamma], num_ctrl=2).matrix, ctrl1,
-        ctrl2, targ)
+    self._apply_(
+        U_gate(parameters=[theta, phi, lamda, gamma]), [ctrl1, ctrl2], [targ])
 
 
 def ccrx(self, theta, ctrl1, ctrl2, targ):
@@ -232,8 +223,7 @@ def ccrx(self, theta, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Rx_gate(parameters=[theta], num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(Rx_gate(parameters=[theta]), [ctrl1, ctrl2], [targ])
 
 
 def ccry(self, theta, ctrl1, ctrl2, targ):
@@ -254,8 +244,7 @@ def ccry(self, theta, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Ry_gate(parameters=[theta], num_ctrl=2).matrix, ctrl1, ctrl2, targ)
+    self._apply_(Ry_gate(parameters=[theta]), [ctrl1, ctrl2], [targ])
 
 
 def ccrz(self, theta, ctrl1, ctrl2, targ):
@@ -276,5 +265,4 @@ def ccrz(self, theta, ctrl1, ctrl2, targ):
         self.statevector --- qubit state vector.
             type: numpy.ndarray, complex
     '''
-    self._triple_qubit_manipulation_(
-        Rz_gate(parameters=[theta], num_ctrl=2).matrix, ctrl1, ctrl2, targ)
\ No newline at end of file
+    self._apply_(Rz_gate(parameters=[theta]), [ctrl1, ctrl2], [targ])
\ No newline at end of file
@@ -21,6 +21,10 @@ __all__ = [
     'U1_gate',
     'U2_gate',
     'U3_gate',
+    #----Custom gates----
+    'Unitary_gate',
+    #----Matrix cache----
+    'matrix_cache',
 ]
 
 from .h import H_gate
@@ -39,4 +43,8 @@ from .ry import Ry_gate
 from .rz import Rz_gate
 from .u1 import U1_gate
 from .u2 import U2_gate
-from .u3 import U3_gate
\ No newline at end of file
+from .u3 import U3_gate
+
+from .unitary import Unitary_gate
+
+from ._basic_gate_ import matrix_cache
\ No newline at end of file
@@ -6,14 +6,22 @@ content:
   function,
       _add_control_
       _inverse_
+      _is_diagonal_
+      _is_permutation_
+      _stack_
+      _variant_
   class,
+      _Matrix_cache_
       _Basic_gate_
       _Parameter_gate_
+  object,
+      matrix_cache
 
 '''
 
 
-from numpy import array, log, eye
+from collections import OrderedDict
+from numpy import array, log, eye, broadcast_arrays, moveaxis
 
 
 def _add_control_(matrix, num_ctrl=1):
@@ -39,9 +47,7 @@ def _add_control_(matrix, num_ctrl=1):
 
     altered = eye(N=2**(num_qubits + num_ctrl), dtype=complex)
     offset = 2**(num_qubits + num_ctrl) - num_row
-    for i_row in range(num_row):
-        for i_col in range(num_col):
-            altered[i_row + offset, i_col + offset] = mat[i_row, i_col]
+    altered[offset:, offset:] = mat
 
     return altered
 
@@ -49,19 +55,172 @@ def _add_control_(matrix, num_ctrl=1):
 def _inverse_(matrix):
     '''
     Invert a gate matrix, apply a dagger(transpose and conjugate) operation.
+    A stack of matrices is inverted one by one.
     -In:
-        matrix --- gate matrix.
+        matrix --- gate matrix, or a stack of gate matrices.
             type: numpy.ndarray
     -Out:
         inverse --- inverse matrix.
             type: numpy.ndarray    
     '''
     mat = array(matrix)
-    inverse = mat.transpose().conj()
+    inverse = mat.swapaxes(-1, -2).conj()
 
     return inverse
 
 
+def _is_diagonal_(matrix):
+    '''
+    Check if a gate matrix is diagonal.
+    A stack of matrices is diagonal if every matrix is.
+    -In:
+        matrix --- gate matrix, or a stack of gate matrices.
+            type: numpy.ndarray
+    -Out:
+        flag --- whether all off-diagonal elements are zero.
+            type: bool
+    '''
+    mat = array(matrix)
+    flag = not (mat * (1 - eye(mat.shape[-1]))).any()
+
+    return flag
+
+
+def _is_permutation_(matrix):
+    '''
+    Check if a gate matrix is a permutation matrix.
+    A stack of matrices is never taken as a permutation.
+    -In:
+        matrix --- gate matrix.
+            type: numpy.ndarray
+    -Out:
+        flag --- whether each row and column holds a single 1, others are 0.
+            type: bool
+    '''
+    mat = array(matrix)
+    flag = bool(mat.ndim == 2 and ((mat == 0) | (mat == 1)).all()
+                and (mat.sum(axis=0) == 1).all()
+                and (mat.sum(axis=1) == 1).all())
+
+    return flag
+
+
+def _stack_(rows):
+    '''
+    Build a gate matrix from its elements.
+
+    Elements could be arrays of a same shape, such as angles of a batch. 
+    Then a stack of matrices is returned, with matrix axes at last.
+    -In:
+        rows --- rows of matrix elements.
+            type: sequence of sequences
+    -Out:
+        stack --- gate matrix, or a stack of gate matrices.
+            type: numpy.ndarray
+    '''
+    elements = broadcast_arrays(*[e for row in rows for e in row])
+    stack = array(elements).reshape(
+        (len(rows), len(rows[0])) + elements[0].shape)
+    stack = moveaxis(stack, [0, 1], [-2, -1])
+
+    return stack
+
+
+def _variant_(matrix, num_ctrl=0, inverse=False):
+    '''
+    Alter a gate matrix with controls and inversion.
+    -In:
+        matrix --- gate matrix.
+            type: numpy.ndarray
+        num_ctrl --- number of controls to add.
+            type: int
+        inverse --- invert the gate or not.
+            type: bool
+    -Out:
+        altered --- altered gate matrix.
+            type: numpy.ndarray
+    '''
+    altered = matrix
+    if num_ctrl != 0:
+        altered = _add_control_(altered, num_ctrl=num_ctrl)
+    if inverse == True:
+        altered = _inverse_(altered)
+
+    return altered
+
+
+class _Matrix_cache_(object):
+    '''
+    Cache of gate matrices.
+
+    Controlled and inverse variants of fixed gates are built once and kept. 
+    Matrices of parameterised gates are keyed by (gate class, parameters, 
+    num_ctrl, inverse), the least recently used one is dropped when more 
+    than "maxsize" are held.
+
+    Cached matrices are shared by gate instances, thus set read-only.
+    '''
+    maxsize = 4096
+    hits = 0
+    misses = 0
+
+    def __init__(self, maxsize=4096):
+        '''
+        -In:
+            maxsize --- maximum number of parameterised gate matrices.
+                type: int
+        '''
+        self.maxsize = maxsize
+        self._fixed_ = {}
+        self._parameterised_ = OrderedDict()
+
+    def __len__(self):
+        return len(self._fixed_) + len(self._parameterised_)
+
+    def get(self, key, build, fixed=False):
+        '''
+        Get a gate matrix, build it if not cached.
+
+        -In:
+            key --- (gate class, parameters, num_ctrl, inverse).
+                type: tuple
+            build --- function returns the gate matrix.
+                type: function
+            fixed --- a fixed gate or a parameterised gate.
+                type: bool
+
+        -Return:
+            matrix --- gate matrix.
+                type: numpy.ndarray
+        '''
+        store = self._fixed_ if fixed else self._parameterised_
+        if key in store:
+            self.hits += 1
+            if not fixed:
+                store.move_to_end(key)
+            return store[key]
+
+        self.misses += 1
+        matrix = array(build())
+        matrix.setflags(write=False)
+        store[key] = matrix
+        if len(self._parameterised_) > self.maxsize:
+            self._parameterised_.popitem(last=False)
+        return matrix
+
+    def clear(self):
+        '''
+        Drop all matrices and reset the statistics.
+        '''
+        self._fixed_.clear()
+        self._parameterised_.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+matrix_cache = _Matrix_cache_()
+
+
 class _Basic_gate_(object):
     '''
     Template class. Contains basic information of a gate.
@@ -81,16 +240,25 @@ class _Basic_gate_(object):
         '''
         if num_ctrl != 0:
             self.num_ctrl = num_ctrl
-            self.matrix = _add_control_(self.matrix, num_ctrl=num_ctrl)
         if inverse == True:
             self.inverse = True
-            self.matrix = _inverse_(self.matrix)
+        if num_ctrl != 0 or inverse == True:
+            key = (type(self), None, num_ctrl, True if inverse else False)
+            self.matrix = matrix_cache.get(
+                key, lambda: _variant_(self.matrix, num_ctrl, inverse), True)
 
 
 class _Parameter_gate_(_Basic_gate_):
     '''
     Template class for parameterised gates.
+
+    "half_angles" tells how each parameter enters the matrix, as a half 
+    angle like theta in exp(-i theta/2 X), or as a full phase angle like 
+    phi in diag(1, exp(i phi)). It decides the parameter-shift rule.
     '''
+    parameters = None
+    half_angles = ()
+
     def __init__(self, parameters, num_ctrl=0, inverse=False):
         '''
         -In:
@@ -101,11 +269,23 @@ class _Parameter_gate_(_Basic_gate_):
             inverse --- the basic gate or its inverse.
                 type: bool
         '''
-        # "_matrix_" method will be realized in successors.
-        self._matrix_(parameters)
+        self.parameters = parameters
         if num_ctrl != 0:
             self.num_ctrl = num_ctrl
-            self.matrix = _add_control_(self.matrix, num_ctrl=num_ctrl)
         if inverse == True:
             self.inverse = True
-            self.matrix = _inverse_(self.matrix)
\ No newline at end of file
+
+        def build():
+            # "_matrix_" method will be realized in successors.
+            self._matrix_(parameters)
+            return _variant_(self.matrix, num_ctrl, inverse)
+
+        try:
+            key = (type(self), tuple(parameters), num_ctrl,
+                   True if inverse else False)
+            hash(key)
+        except TypeError:
+            # unhashable parameters are not cached
+            self.matrix = build()
+        else:
+            self.matrix = matrix_cache.get(key, build)
\ No newline at end of file
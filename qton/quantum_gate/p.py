@@ -9,16 +9,17 @@ content:
 
 '''
 
-from numpy import array, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _p_(phi):
-    return array([[1, 0], [0, exp(1j * phi)]])
+    return _stack_([[1, 0], [0, exp(1j * phi)]])
 
 
 class P_gate(_Parameter_gate_):
     base = 'Phase'
+    half_angles = (False, )
 
     def _matrix_(self, parameters):
         self.matrix = _p_(parameters[0])
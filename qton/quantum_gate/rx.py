@@ -9,13 +9,13 @@ content:
 
 '''
 
-from numpy import array, sin, cos
-from ._basic_gate_ import _Parameter_gate_
+from numpy import sin, cos
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _rx_(theta):
     t = theta * 0.5
-    return array([
+    return _stack_([
         [cos(t), -1j * sin(t)],
         [-1j * sin(t), cos(t)],
     ])
@@ -23,6 +23,7 @@ def _rx_(theta):
 
 class Rx_gate(_Parameter_gate_):
     base = 'Rotation-X'
+    half_angles = (True, )
 
     def _matrix_(self, parameters):
         self.matrix = _rx_(parameters[0])
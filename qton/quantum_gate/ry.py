@@ -9,13 +9,13 @@ content:
 
 '''
 
-from numpy import array, sin, cos
-from ._basic_gate_ import _Parameter_gate_
+from numpy import sin, cos
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _ry_(theta):
     t = theta * 0.5
-    return array([
+    return _stack_([
         [cos(t), -sin(t)],
         [sin(t), cos(t)],
     ])
@@ -23,6 +23,7 @@ def _ry_(theta):
 
 class Ry_gate(_Parameter_gate_):
     base = 'Rotation-Y'
+    half_angles = (True, )
 
     def _matrix_(self, parameters):
         self.matrix = _ry_(parameters[0])
@@ -9,13 +9,13 @@ content:
 
 '''
 
-from numpy import array, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _rz_(theta):
     t = theta * 0.5
-    return array([
+    return _stack_([
         [exp(-1j * t), 0],
         [0, exp(1j * t)],
     ])
@@ -23,6 +23,7 @@ def _rz_(theta):
 
 class Rz_gate(_Parameter_gate_):
     base = 'Rotation-Z'
+    half_angles = (True, )
 
     def _matrix_(self, parameters):
         self.matrix = _rz_(parameters[0])
@@ -9,20 +9,22 @@ content:
 
 '''
 
-from numpy import array, sin, cos, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import sin, cos, exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _u_(theta, phi, lamda, gamma):
     t = theta * 0.5
-    return array(
-        [[cos(t), -exp(1j * lamda) * sin(t)],
-         [exp(1j * phi) * sin(t),
-          exp(1j * lamda + 1j * phi) * cos(t)]]) * exp(1j * gamma)
+    g = exp(1j * gamma)
+    return _stack_(
+        [[cos(t) * g, -exp(1j * lamda) * sin(t) * g],
+         [exp(1j * phi) * sin(t) * g,
+          exp(1j * lamda + 1j * phi) * cos(t) * g]])
 
 
 class U_gate(_Parameter_gate_):
     base = 'Universal'
+    half_angles = (True, False, False, False)
 
     def _matrix_(self, parameters):
         self.matrix = _u_(*parameters[0:4])
@@ -9,16 +9,17 @@ content:
 
 '''
 
-from numpy import array, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _u1_(lamda):
-    return array([[1, 0], [0, exp(1j * lamda)]])
+    return _stack_([[1, 0], [0, exp(1j * lamda)]])
 
 
 class U1_gate(_Parameter_gate_):
     base = 'U1-gate'
+    half_angles = (False, )
 
     def _matrix_(self, parameters):
         self.matrix = _u1_(parameters[0])
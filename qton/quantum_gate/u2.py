@@ -9,17 +9,18 @@ content:
 
 '''
 
-from numpy import array, sqrt, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import sqrt, exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _u2_(phi, lamda):
-    return array([[1, -exp(1j * lamda)],
+    return _stack_([[1, -exp(1j * lamda)],
                   [exp(1j * phi), exp(1j * lamda + 1j * phi)]]) * sqrt(0.5)
 
 
 class U2_gate(_Parameter_gate_):
     base = 'U2-gate'
+    half_angles = (False, False)
 
     def _matrix_(self, parameters):
         self.matrix = _u2_(*parameters[0:2])
@@ -9,13 +9,13 @@ content:
 
 '''
 
-from numpy import array, cos, sin, exp
-from ._basic_gate_ import _Parameter_gate_
+from numpy import cos, sin, exp
+from ._basic_gate_ import _Parameter_gate_, _stack_
 
 
 def _u3_(theta, phi, lamda):
     t = theta * 0.5
-    return array(
+    return _stack_(
         [[cos(t), -exp(1j * lamda) * sin(t)],
          [exp(1j * phi) * sin(t),
           exp(1j * lamda + 1j * phi) * cos(t)]])
@@ -23,6 +23,7 @@ def _u3_(theta, phi, lamda):
 
 class U3_gate(_Parameter_gate_):
     base = 'U3-gate'
+    half_angles = (True, False, False)
 
     def _matrix_(self, parameters):
         self.matrix = _u3_(*parameters[0:3])
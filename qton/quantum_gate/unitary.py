@@ -0,0 +1,31 @@
+'''
+path: qton/quantum_gate/unitary.py
+content:
+
+  class,
+      Unitary_gate
+
+'''
+
+from numpy import array
+from ._basic_gate_ import _Basic_gate_, _variant_
+
+
+class Unitary_gate(_Basic_gate_):
+    base = 'Unitary'
+
+    def __init__(self, matrix, num_ctrl=0, inverse=False):
+        '''
+        -In:
+            matrix --- user-supplied gate matrix.
+                type: numpy.ndarray
+            num_ctrl --- number of gate controls.
+                type: int
+            inverse --- the basic gate or its inverse.
+                type: bool
+        '''
+        if num_ctrl != 0:
+            self.num_ctrl = num_ctrl
+        if inverse == True:
+            self.inverse = True
+        self.matrix = _variant_(array(matrix), num_ctrl, inverse)
@@ -0,0 +1,46 @@
+'''
+path: tests/test_optimize.py
+content:
+
+  function,
+      test_window_keeps_order
+      test_small_angles_kept
+
+'''
+
+from numpy import abs
+from qton import Quantum_circuit
+
+
+def _check_(build):
+    '''
+    Build a circuit twice, optimize one, and compare their states.
+    '''
+    plain = Quantum_circuit(2, deferred=True)
+    build(plain)
+    optimized = Quantum_circuit(2, deferred=True)
+    build(optimized)
+    optimized.optimize()
+    assert abs(plain.statevector - optimized.statevector).max() < 1e-12
+
+
+def test_window_keeps_order():
+    # the first cx is out of the window of qubit 0, but not of qubit 1
+    def build(qc):
+        qc.ry(0.7, 0)
+        qc.ry(1.3, 1)
+        qc.cx(0, 1)
+        qc.x(0)
+        for _ in range(8):
+            qc.s(0)
+            qc.t(0)
+        qc.cx(0, 1)
+
+    _check_(build)
+
+
+def test_small_angles_kept():
+    _check_(lambda qc: (qc.h(0), qc.rz(2e-5, 0), qc.h(0)))
+    _check_(lambda qc: (qc.h(0), qc.rx(0.3, 0), qc.rx(-0.3 + 3e-5, 0)))
+    _check_(lambda qc: (qc.h(0), qc.rz(0.3, 0), qc.rx(1e-6, 0),
+                        qc.rz(0.2, 0)))